@@ -7,14 +7,26 @@ import sqlite3
 
 from flask import Flask, jsonify, render_template, request
 
-from config import APP_CONFIG, DB_PATH, MODEL_PATH, VECTORIZER_PATH
+from config import (
+    ADMISSION_CONFIG,
+    APP_CONFIG,
+    DB_PATH,
+    MODEL_PATH,
+    SHADOW_CONFIG,
+    SHADOW_MODEL_DIR,
+    VECTORIZER_PATH,
+)
+from modules.admission import AdmissionController, render_rejection
 from modules.predictor import predict_label
+from modules.shadow import ShadowEvaluator
 
 logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.config.update(APP_CONFIG)
+admission = AdmissionController.from_config(ADMISSION_CONFIG)
+shadow = ShadowEvaluator(SHADOW_MODEL_DIR, **SHADOW_CONFIG)
 
 
 def get_db_connection() -> sqlite3.Connection:
@@ -57,6 +69,7 @@ def about():
 
 
 @app.route("/detect", methods=["GET", "POST"])
+@admission.guard("interactive", on_reject=render_rejection("detect.html"))
 def detect():
     """Render detection page."""
     if request.method == "POST":
@@ -71,18 +84,70 @@ def detect():
     return render_template("detect.html")
 
 
+MAX_EXPLAIN_TERMS = 50
+
+
+def _explain_options(payload: dict) -> tuple[bool, int]:
+    """Read the explain flag and ``top_k`` from the JSON body or query string."""
+    flag = payload.get("explain", request.args.get("explain", ""))
+    explain = flag is True or str(flag).lower() in {"1", "true", "yes"}
+    try:
+        top_k = int(payload.get("top_k", request.args.get("top_k", 10)))
+    except (TypeError, ValueError):
+        top_k = 10
+    return explain, min(max(top_k, 1), MAX_EXPLAIN_TERMS)
+
+
 @app.route("/predict", methods=["POST"])
+@admission.guard("api")
 def api_predict():
-    """JSON API endpoint."""
+    """JSON API endpoint; pass ``"explain": true`` to include top terms."""
     payload = request.get_json(silent=True) or {}
     text = payload.get("text", "")
     if not text.strip():
         return jsonify({"error": "Text is required"}), 400
-    prediction = predict_label(text, MODEL_PATH, VECTORIZER_PATH)
+    explain, top_k = _explain_options(payload)
+    timings: dict = {}
+    prediction = predict_label(
+        text,
+        MODEL_PATH,
+        VECTORIZER_PATH,
+        explain=explain,
+        top_k=top_k,
+        timings=timings,
+    )
+    shadow.submit(text, prediction, timings.get("scoring_cpu_ms"))
     save_manual_input(text, prediction)
     return jsonify({"text": text, **prediction})
 
 
+@app.route("/explain", methods=["POST"])
+@admission.guard("api")
+def api_explain():
+    """JSON endpoint returning the prediction and its top contributing terms."""
+    payload = request.get_json(silent=True) or {}
+    text = payload.get("text", "")
+    if not text.strip():
+        return jsonify({"error": "Text is required"}), 400
+    _, top_k = _explain_options(payload)
+    prediction = predict_label(
+        text, MODEL_PATH, VECTORIZER_PATH, explain=True, top_k=top_k
+    )
+    return jsonify({"text": text, **prediction})
+
+
+@app.route("/admission/stats")
+def admission_stats():
+    """Shed and queue-depth counters for tuning admission limits."""
+    return jsonify(admission.stats())
+
+
+@app.route("/shadow/stats")
+def shadow_stats():
+    """Live agreement, confidence and latency of the shadow candidate."""
+    return jsonify(shadow.stats())
+
+
 def save_manual_input(text: str, prediction: dict) -> None:
     """Persist manual detection to DB."""
     conn = get_db_connection()
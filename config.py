@@ -1,5 +1,6 @@
 """Central configuration for TrueBot application."""
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -8,13 +9,47 @@ DATA_PATH = BASE_DIR / "data" / "news.csv"
 MODEL_DIR = BASE_DIR / "model"
 MODEL_PATH = MODEL_DIR / "model.pkl"
 VECTORIZER_PATH = MODEL_DIR / "vectorizer.pkl"
-DB_PATH = BASE_DIR / "database" / "truebot.db"
+LEMMA_TABLE_NAME = "lemmas.json"
+LEMMA_TABLE_PATH = MODEL_DIR / LEMMA_TABLE_NAME
+# scikit-learn-free copy of model.pkl/vectorizer.pkl (see modules/serving.py)
+SERVING_BUNDLE_NAME = "serving.joblib"
+SHADOW_MODEL_DIR = MODEL_DIR / "shadow"
+# Overridable so load tests can run against a scratch copy of the database.
+DB_PATH = Path(
+    os.environ.get("TRUEBOT_DB_PATH", BASE_DIR / "database" / "truebot.db")
+)
 LOG_PATH = BASE_DIR / "truebot.log"
 
+MAX_PAYLOAD_BYTES = 256 * 1024
+
 APP_CONFIG = {
     "SECRET_KEY": "replace-this-with-env-secret",
     "PERMANENT_SESSION_LIFETIME": timedelta(hours=12),
     "JSON_SORT_KEYS": False,
+    "MAX_CONTENT_LENGTH": MAX_PAYLOAD_BYTES,
 }
 
+# Admission control for /detect, /predict and /explain (see modules/admission.py).
+# Limits apply per worker process.
+ADMISSION_CONFIG = {
+    "max_inflight": 8,
+    "interactive_reserve": 2,
+    "max_queue": {"interactive": 16, "api": 8},
+    "queue_timeout": 2.0,
+    # (tokens per second, burst) per client and lane
+    "rate_limits": {"interactive": (1.0, 10), "api": (5.0, 20)},
+    "max_payload_bytes": MAX_PAYLOAD_BYTES,
+    # Shed requests that already waited this long upstream (X-Request-Start)
+    "max_request_age": 10.0,
+    # Proxies in front of the app that append to X-Forwarded-For (1 on Render).
+    # 0 keys rate limits on the peer address; never trust client-set entries.
+    "trusted_proxy_hops": int(os.environ.get("TRUEBOT_TRUSTED_PROXY_HOPS", 0)),
+}
 
+# Candidate model scored off the request path (see modules/shadow.py).
+SHADOW_CONFIG = {
+    "queue_size": 1000,
+    # The scorer is a separate process but still needs CPU; score a sample.
+    "sample_rate": 0.25,
+    "window": 10_000,
+}
@@ -0,0 +1,23 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+Threaded workers let each process hold several requests at once, so the
+in-flight cap, lane queues and interactive priority in ``modules/admission.py``
+take effect. There is one thread per in-flight slot and per lane queue place.
+Waiting requests then sit in the admission lanes, where interactive posts are
+admitted first and timeouts are shed with 503. Otherwise they would wait in
+gunicorn's own FIFO queue.
+"""
+
+from config import ADMISSION_CONFIG
+
+worker_class = "gthread"
+threads = ADMISSION_CONFIG["max_inflight"] + sum(ADMISSION_CONFIG["max_queue"].values())
+
+
+def post_worker_init(worker):
+    """Load and exercise the model before the worker accepts requests."""
+    from config import MODEL_PATH, VECTORIZER_PATH
+    from modules.predictor import warm_up
+
+    warm_up(MODEL_PATH, VECTORIZER_PATH)
@@ -0,0 +1,300 @@
+"""
+Admission control for the prediction endpoints.
+
+Every guarded request goes through four checks in order:
+
+1. payload size (413),
+2. a per-client token bucket for its lane (429 + ``Retry-After``); the token
+   is only spent once the request is admitted,
+3. request age from an upstream ``X-Request-Start`` header, when one is
+   present (503),
+4. a bounded in-flight counter with a short wait queue per lane (503 +
+   ``Retry-After`` when the queue is full or the wait times out).
+
+There are two lanes: ``interactive`` (form posts from the UI) and ``api``
+(JSON clients). API traffic may only use ``max_inflight - interactive_reserve``
+slots, and waiting interactive requests are admitted first. Counters are
+per process, so with several gunicorn workers each one enforces its own
+limits.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response, jsonify, make_response, render_template, request
+
+LANES = ("interactive", "api")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the HTTP status and retry hint."""
+
+    def __init__(self, status: int, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets refilled at ``rate`` tokens/second up to ``burst``.
+
+    At most ``max_keys`` buckets are kept. The least recently used one is
+    dropped first, which resets that client to a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _tokens(self, key: str, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        return min(float(self.burst), tokens + (now - updated) * self.rate)
+
+    def _wait(self, tokens: float) -> float:
+        return 0.0 if tokens >= 1.0 else (1.0 - tokens) / self.rate
+
+    def wait_time(self, key: str, now: Optional[float] = None) -> float:
+        """Seconds until ``key`` has a token (0.0 if it has one); takes nothing."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._wait(self._tokens(key, now))
+
+    def consume(self, key: str, now: Optional[float] = None) -> float:
+        """Take one token; return 0.0 on success or the seconds until one is free."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens = self._tokens(key, now)
+            wait = self._wait(tokens)
+            if not wait:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionController:
+    """Bounded in-flight slots shared by prioritised lanes, plus shed counters."""
+
+    def __init__(
+        self,
+        max_inflight: int = 8,
+        interactive_reserve: int = 2,
+        max_queue: Optional[Dict[str, int]] = None,
+        queue_timeout: float = 2.0,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        max_payload_bytes: int = 256 * 1024,
+        max_request_age: Optional[float] = None,
+        trusted_proxy_hops: int = 0,
+    ) -> None:
+        self.max_inflight = max_inflight
+        self.lane_limits = {
+            "interactive": max_inflight,
+            "api": max(1, max_inflight - interactive_reserve),
+        }
+        self.max_queue = max_queue or {"interactive": 16, "api": 8}
+        self.queue_timeout = queue_timeout
+        self.max_payload_bytes = max_payload_bytes
+        self.max_request_age = max_request_age
+        self.trusted_proxy_hops = trusted_proxy_hops
+        self.limiters = {
+            lane: TokenBucketLimiter(rate, burst)
+            for lane, (rate, burst) in (rate_limits or {}).items()
+        }
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._waiting = {lane: 0 for lane in LANES}
+        self._stats = {
+            lane: {
+                "admitted": 0,
+                "queued": 0,
+                "shed_payload": 0,
+                "shed_rate_limit": 0,
+                "shed_stale": 0,
+                "shed_queue_full": 0,
+                "shed_queue_timeout": 0,
+                "max_queue_depth": 0,
+            }
+            for lane in LANES
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "AdmissionController":
+        return cls(**config)
+
+    def stats(self) -> Dict[str, object]:
+        """Snapshot of in-flight, queue depth and per-lane counters."""
+        with self._cond:
+            return {
+                "in_flight": self._inflight,
+                "max_inflight": self.max_inflight,
+                "queue_depth": dict(self._waiting),
+                "lanes": {lane: dict(values) for lane, values in self._stats.items()},
+            }
+
+    def _shed(self, lane: str, counter: str, status: int, retry_after: float):
+        with self._cond:
+            self._stats[lane][counter] += 1
+        return AdmissionRejected(status, counter, retry_after)
+
+    def check(self, lane: str, client: str, content_length: Optional[int], started_at):
+        """Run the cheap, non-blocking checks; raise :class:`AdmissionRejected`."""
+        if content_length is not None and content_length > self.max_payload_bytes:
+            raise self._shed(lane, "shed_payload", 413, 0)
+        limiter = self.limiters.get(lane)
+        if limiter is not None:
+            wait = limiter.wait_time(client)
+            if wait > 0:
+                raise self._shed(lane, "shed_rate_limit", 429, wait)
+        if self.max_request_age is not None and started_at is not None:
+            if time.time() - started_at > self.max_request_age:
+                raise self._shed(lane, "shed_stale", 503, 1)
+
+    def acquire(self, lane: str) -> None:
+        """Take an in-flight slot, waiting up to ``queue_timeout`` in the lane queue."""
+        with self._cond:
+            if self._can_enter(lane):
+                self._enter(lane)
+                return
+            if self._waiting[lane] >= self.max_queue.get(lane, 0):
+                self._stats[lane]["shed_queue_full"] += 1
+                raise AdmissionRejected(503, "shed_queue_full", self.queue_timeout)
+            self._waiting[lane] += 1
+            stats = self._stats[lane]
+            stats["queued"] += 1
+            stats["max_queue_depth"] = max(
+                stats["max_queue_depth"], self._waiting[lane]
+            )
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: self._can_enter(lane), timeout=self.queue_timeout
+                )
+            finally:
+                self._waiting[lane] -= 1
+            if not admitted:
+                # A departing interactive waiter may unblock queued API calls.
+                self._cond.notify_all()
+                stats["shed_queue_timeout"] += 1
+                raise AdmissionRejected(503, "shed_queue_timeout", self.queue_timeout)
+            self._enter(lane)
+
+    def charge(self, lane: str, client: str) -> None:
+        """Spend ``client``'s rate-limit token for an admitted request."""
+        limiter = self.limiters.get(lane)
+        if limiter is not None:
+            limiter.consume(client)
+
+    def release(self) -> None:
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    def _can_enter(self, lane: str) -> bool:
+        if self._inflight >= self.lane_limits[lane]:
+            return False
+        # Interactive requests that are already waiting go first.
+        return lane == "interactive" or self._waiting["interactive"] == 0
+
+    def _enter(self, lane: str) -> None:
+        self._inflight += 1
+        self._stats[lane]["admitted"] += 1
+
+    def client_key(self) -> str:
+        """
+        Rate-limit key: the peer address, or the ``X-Forwarded-For`` entry that
+        the outermost of ``trusted_proxy_hops`` proxies appended.
+
+        Entries further left are client-supplied and can be spoofed.
+        """
+        if self.trusted_proxy_hops:
+            forwarded = [
+                part.strip()
+                for part in request.headers.get("X-Forwarded-For", "").split(",")
+                if part.strip()
+            ]
+            if len(forwarded) >= self.trusted_proxy_hops:
+                return forwarded[-self.trusted_proxy_hops]
+        return request.remote_addr or "unknown"
+
+    def guard(
+        self,
+        lane: str,
+        on_reject: Optional[Callable[[AdmissionRejected], Response]] = None,
+    ):
+        """Decorate a view so its POST requests pass admission control first."""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != "POST":
+                    return view(*args, **kwargs)
+                client = self.client_key()
+                try:
+                    self.check(
+                        lane, client, request.content_length, request_start_time()
+                    )
+                    self.acquire(lane)
+                except AdmissionRejected as rejected:
+                    return rejection_response(rejected, on_reject)
+                self.charge(lane, client)
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    self.release()
+
+            return wrapper
+
+        return decorator
+
+
+def request_start_time() -> Optional[float]:
+    """Parse the proxy ``X-Request-Start`` header (``t=<ms|us|s>``) to epoch seconds."""
+    raw = request.headers.get("X-Request-Start", "")
+    try:
+        value = float(raw.split("=", 1)[-1])
+    except ValueError:
+        return None
+    while value > 1e11:  # milliseconds or microseconds
+        value /= 1000.0
+    return value
+
+
+MESSAGES = {
+    413: "Text is too long.",
+    429: "Too many requests. Please slow down.",
+    503: "TrueBot is busy right now. Please try again shortly.",
+}
+
+
+def rejection_response(
+    rejected: AdmissionRejected,
+    on_reject: Optional[Callable[[AdmissionRejected], Response]] = None,
+) -> Response:
+    """JSON (or ``on_reject``) body with the status and a ``Retry-After`` header."""
+    if on_reject is not None:
+        response = make_response(on_reject(rejected), rejected.status)
+    else:
+        response = make_response(
+            jsonify({"error": MESSAGES[rejected.status], "reason": rejected.reason}),
+            rejected.status,
+        )
+    if rejected.retry_after:
+        response.headers["Retry-After"] = str(max(1, math.ceil(rejected.retry_after)))
+    return response
+
+
+def render_rejection(template: str) -> Callable[[AdmissionRejected], str]:
+    """``on_reject`` for form views: re-render ``template`` with an error."""
+    return lambda rejected: render_template(template, error=MESSAGES[rejected.status])
@@ -0,0 +1,459 @@
+"""
+Post-training compression for TrueBot serving artifacts.
+
+Three steps are applied to whatever ``persist_model`` saved:
+
+* ``compact`` - tree ensembles (random forest, XGBoost) are exported into flat
+  node arrays scored by :class:`CompactTreeEnsemble`. Linear models skip it.
+* ``prune`` - TF-IDF features whose classifier weight is negligible are
+  dropped from the vocabulary and from the classifier. Rows are L2-normalised
+  over the smaller vocabulary, so predictions can shift slightly.
+* ``float32`` - vocabulary IDF, coefficients and split thresholds are cast to
+  ``float32``.
+
+Each step is measured for artifact size, load time, single-request latency
+and held-out accuracy::
+
+    python -m modules.compression --output model/compressed
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from joblib import dump, load
+
+LOGGER = logging.getLogger(__name__)
+
+TREE_LEAF = -1
+
+
+class CompactTreeEnsemble:
+    """
+    Tree ensemble stored as flat ``numpy`` arrays.
+
+    All trees share one node table; ``roots`` holds the index of each tree's
+    first node. Internal nodes send a sample left when ``x <= threshold``,
+    with ``x`` compared as ``float32`` just like sklearn and XGBoost do. Leaf
+    values are class-1 probabilities averaged over trees (``"mean"``) or
+    margins summed onto ``base_margin`` and passed through a sigmoid
+    (``"logistic"``).
+    """
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        n_features: int,
+        aggregation: str = "mean",
+        base_margin: float = 0.0,
+        zero_as_missing: bool = False,
+        feature_importances: Optional[np.ndarray] = None,
+    ) -> None:
+        self.roots = roots.astype(np.int32)
+        self.feature = feature.astype(np.int32)
+        self.threshold = threshold
+        self.left = left.astype(np.int32)
+        self.right = right.astype(np.int32)
+        self.default_left = default_left.astype(bool)
+        self.value = value
+        self.n_features_in_ = n_features
+        self.aggregation = aggregation
+        self.base_margin = base_margin
+        self.zero_as_missing = zero_as_missing
+        # Kept for term-level explanations; not used for scoring.
+        self.feature_importances_ = feature_importances
+        self.classes_ = np.array([0, 1])
+
+    @classmethod
+    def from_sklearn_forest(cls, forest) -> "CompactTreeEnsemble":
+        """Export a fitted binary ``RandomForestClassifier``."""
+        parts: List[Tuple[np.ndarray, ...]] = []
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            counts = tree.value[:, 0, :]
+            proba = counts[:, 1] / counts.sum(axis=1)
+            leaf = tree.children_left == TREE_LEAF
+            parts.append(
+                (
+                    np.where(leaf, 0, tree.feature),
+                    tree.threshold.astype(np.float64),
+                    tree.children_left,
+                    tree.children_right,
+                    np.ones(tree.node_count, dtype=bool),
+                    proba,
+                )
+            )
+        return cls._concat(
+            parts,
+            forest.n_features_in_,
+            aggregation="mean",
+            feature_importances=forest.feature_importances_,
+        )
+
+    @classmethod
+    def from_xgboost(cls, model) -> "CompactTreeEnsemble":
+        """Export a fitted binary ``XGBClassifier`` (``binary:logistic``)."""
+        booster = model.get_booster()
+        config = json.loads(booster.save_config())
+        # XGBoost >= 3 stores a per-target vector, e.g. "[5E-1]".
+        raw_score = config["learner"]["learner_model_param"]["base_score"]
+        base_score = float(raw_score.strip("[]").split(",")[0])
+        names = booster.feature_names
+        index_of = {name: idx for idx, name in enumerate(names)} if names else {}
+        parts: List[Tuple[np.ndarray, ...]] = []
+        for dumped in booster.get_dump(dump_format="json"):
+            nodes: Dict[int, dict] = {}
+            stack = [json.loads(dumped)]
+            while stack:
+                node = stack.pop()
+                nodes[node["nodeid"]] = node
+                stack.extend(node.get("children", []))
+            local = {node_id: pos for pos, node_id in enumerate(sorted(nodes))}
+            size = len(local)
+            feature = np.zeros(size, dtype=np.int64)
+            threshold = np.zeros(size, dtype=np.float64)
+            left = np.full(size, TREE_LEAF, dtype=np.int64)
+            right = np.full(size, TREE_LEAF, dtype=np.int64)
+            default_left = np.ones(size, dtype=bool)
+            value = np.zeros(size, dtype=np.float64)
+            for node_id, node in nodes.items():
+                pos = local[node_id]
+                if "leaf" in node:
+                    value[pos] = node["leaf"]
+                    continue
+                split = node["split"]
+                feature[pos] = index_of[split] if split in index_of else int(split[1:])
+                # XGBoost goes left on x < cond; store the largest float32
+                # below cond so the shared rule x <= threshold holds.
+                cond = np.float32(node["split_condition"])
+                threshold[pos] = np.nextafter(cond, np.float32(-np.inf))
+                left[pos] = local[node["yes"]]
+                right[pos] = local[node["no"]]
+                default_left[pos] = node["missing"] == node["yes"]
+            parts.append((feature, threshold, left, right, default_left, value))
+        base_margin = math.log(base_score / (1.0 - base_score))
+        return cls._concat(
+            parts,
+            model.n_features_in_,
+            aggregation="logistic",
+            base_margin=base_margin,
+            zero_as_missing=True,
+            feature_importances=model.feature_importances_,
+        )
+
+    @classmethod
+    def _concat(cls, parts, n_features: int, **kwargs) -> "CompactTreeEnsemble":
+        roots, offset = [], 0
+        columns: List[List[np.ndarray]] = [[] for _ in range(6)]
+        for feature, threshold, left, right, default_left, value in parts:
+            roots.append(offset)
+            columns[0].append(feature)
+            columns[1].append(threshold)
+            columns[2].append(np.where(left == TREE_LEAF, TREE_LEAF, left + offset))
+            columns[3].append(np.where(right == TREE_LEAF, TREE_LEAF, right + offset))
+            columns[4].append(default_left)
+            columns[5].append(value)
+            offset += len(feature)
+        arrays = [np.concatenate(column) for column in columns]
+        return cls(np.array(roots), *arrays, n_features=n_features, **kwargs)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.roots,
+            self.feature,
+            self.threshold,
+            self.left,
+            self.right,
+            self.default_left,
+            self.value,
+        )
+        return sum(array.nbytes for array in arrays)
+
+    def astype(self, dtype) -> "CompactTreeEnsemble":
+        """Return a copy with thresholds and leaf values cast to ``dtype``."""
+        threshold = self.threshold.astype(dtype)
+        if np.dtype(dtype) == np.float32:
+            # Round down: for float32 x, x <= t32 must match x <= t64.
+            over = threshold.astype(np.float64) > self.threshold
+            threshold[over] = np.nextafter(threshold[over], np.float32(-np.inf))
+        return self._replace(threshold=threshold, value=self.value.astype(dtype))
+
+    def select_features(self, keep: np.ndarray) -> "CompactTreeEnsemble":
+        """
+        Re-index splits onto the kept feature columns.
+
+        A split on a dropped feature always sees an absent (zero) value, so it
+        becomes a pass-through to the branch that zero would take.
+        """
+        remap = np.full(self.n_features_in_, -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+        internal = self.left != TREE_LEAF
+        dropped = internal & (remap[self.feature] < 0)
+        if self.zero_as_missing:
+            zero_left = self.default_left
+        else:
+            zero_left = self.threshold >= 0
+        target = np.where(zero_left, self.left, self.right)
+        left = np.where(dropped, target, self.left)
+        right = np.where(dropped, target, self.right)
+        feature = np.where(internal & ~dropped, remap[self.feature], 0)
+        return self._replace(
+            feature=feature,
+            left=left,
+            right=right,
+            n_features=len(keep),
+            feature_importances=(
+                None
+                if self.feature_importances_ is None
+                else self.feature_importances_[keep]
+            ),
+        )
+
+    def _replace(self, **changes) -> "CompactTreeEnsemble":
+        fields = {
+            "roots": self.roots,
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "default_left": self.default_left,
+            "value": self.value,
+            "n_features": self.n_features_in_,
+            "aggregation": self.aggregation,
+            "base_margin": self.base_margin,
+            "zero_as_missing": self.zero_as_missing,
+            "feature_importances": self.feature_importances_,
+        }
+        fields.update(changes)
+        return CompactTreeEnsemble(**fields)
+
+    def predict_proba(self, X, batch_size: int = 1024) -> np.ndarray:
+        """Return ``(n_samples, 2)`` class probabilities for a CSR or dense ``X``."""
+        outputs = [
+            self._score(X[start : start + batch_size])
+            for start in range(0, X.shape[0], batch_size)
+        ]
+        positive = np.concatenate(outputs) if outputs else np.zeros(0)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+    def _score(self, X) -> np.ndarray:
+        dense = X.toarray() if hasattr(X, "toarray") else np.asarray(X)
+        dense = dense.astype(np.float32, copy=False)
+        rows = np.arange(dense.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (dense.shape[0], len(self.roots))).copy()
+        while True:
+            active = self.left[nodes] != TREE_LEAF
+            if not active.any():
+                break
+            x = dense[rows, self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if self.zero_as_missing:
+                go_left = np.where(x == 0, self.default_left[nodes], go_left)
+            step = np.where(go_left, self.left[nodes], self.right[nodes])
+            nodes = np.where(active, step, nodes)
+        leaves = self.value[nodes].astype(np.float64)
+        if self.aggregation == "mean":
+            return leaves.mean(axis=1)
+        return 1.0 / (1.0 + np.exp(-(self.base_margin + leaves.sum(axis=1))))
+
+
+def is_tree_model(classifier) -> bool:
+    return hasattr(classifier, "estimators_") or hasattr(classifier, "get_booster")
+
+
+def feature_weights(classifier) -> np.ndarray:
+    """Per-feature magnitude: |coef| for linear models, importances for trees."""
+    if hasattr(classifier, "coef_"):
+        return np.abs(np.asarray(classifier.coef_)).max(axis=0)
+    if hasattr(classifier, "feature_importances_"):
+        return np.asarray(classifier.feature_importances_, dtype=np.float64)
+    raise TypeError(f"Cannot derive feature weights for {type(classifier).__name__}")
+
+
+def compact_trees(classifier):
+    """Export tree ensembles to :class:`CompactTreeEnsemble`; pass others through."""
+    if isinstance(classifier, CompactTreeEnsemble) or not is_tree_model(classifier):
+        return classifier
+    if hasattr(classifier, "get_booster"):
+        return CompactTreeEnsemble.from_xgboost(classifier)
+    return CompactTreeEnsemble.from_sklearn_forest(classifier)
+
+
+def prune_features(classifier, vectorizer, weights: np.ndarray, min_weight: float):
+    """
+    Drop zero-weight features and those under ``min_weight`` times the max.
+
+    ``weights`` must come from the original classifier so tree importances are
+    still available after :func:`compact_trees`.
+    """
+    keep = np.flatnonzero((weights > 0) & (weights >= min_weight * weights.max()))
+    if len(keep) == len(weights):
+        return classifier, vectorizer
+
+    position = {old: new for new, old in enumerate(keep)}
+    vectorizer.vocabulary_ = {
+        term: position[index]
+        for term, index in vectorizer.vocabulary_.items()
+        if index in position
+    }
+    vectorizer.idf_ = vectorizer.idf_[keep]
+    vectorizer._tfidf.n_features_in_ = len(keep)
+    if hasattr(vectorizer, "stop_words_"):
+        del vectorizer.stop_words_
+
+    if isinstance(classifier, CompactTreeEnsemble):
+        classifier = classifier.select_features(keep)
+    else:
+        classifier.coef_ = classifier.coef_[:, keep]
+        classifier.n_features_in_ = len(keep)
+    return classifier, vectorizer
+
+
+def cast_float32(classifier, vectorizer):
+    """Cast vectorizer IDF/output and classifier parameters to ``float32``."""
+    vectorizer.dtype = np.float32
+    vectorizer.idf_ = vectorizer.idf_.astype(np.float32)
+    if isinstance(classifier, CompactTreeEnsemble):
+        classifier = classifier.astype(np.float32)
+    elif hasattr(classifier, "coef_"):
+        classifier.coef_ = classifier.coef_.astype(np.float32)
+        classifier.intercept_ = classifier.intercept_.astype(np.float32)
+    return classifier, vectorizer
+
+
+def measure(
+    classifier,
+    vectorizer,
+    texts: Sequence[str],
+    labels: Sequence[int],
+    latency_samples: int = 200,
+) -> Dict[str, float]:
+    """Size on disk, load time, single-request latency and accuracy."""
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = Path(tmp) / "model.pkl"
+        vectorizer_path = Path(tmp) / "vectorizer.pkl"
+        dump(classifier, model_path)
+        dump(vectorizer, vectorizer_path)
+        size = model_path.stat().st_size + vectorizer_path.stat().st_size
+        load_times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            load(model_path)
+            load(vectorizer_path)
+            load_times.append(time.perf_counter() - start)
+
+    latencies = []
+    for text in list(texts)[:latency_samples]:
+        start = time.perf_counter()
+        classifier.predict_proba(vectorizer.transform([text]))
+        latencies.append(time.perf_counter() - start)
+
+    proba = classifier.predict_proba(vectorizer.transform(texts))[:, 1]
+    accuracy = float(np.mean((proba >= 0.5).astype(int) == np.asarray(labels)))
+    return {
+        "size_bytes": size,
+        "load_ms": round(min(load_times) * 1000, 3),
+        "latency_ms": round(float(np.median(latencies)) * 1000, 4),
+        "accuracy": round(accuracy, 4),
+        "n_features": len(vectorizer.vocabulary_),
+    }
+
+
+def compress(
+    classifier,
+    vectorizer,
+    texts: Sequence[str],
+    labels: Sequence[int],
+    min_weight: float = 1e-3,
+):
+    """
+    Run compact -> prune -> float32 and measure after every step.
+
+    ``texts`` must already be preprocessed. Returns the compressed
+    ``(classifier, vectorizer)`` and one report entry per step, with deltas
+    against the previous step.
+    """
+    weights = feature_weights(classifier)
+    report = [{"step": "baseline", **measure(classifier, vectorizer, texts, labels)}]
+
+    def record(step: str, skipped: bool = False) -> None:
+        metrics = measure(classifier, vectorizer, texts, labels)
+        previous = report[-1]
+        deltas = {
+            f"{key}_delta": round(metrics[key] - previous[key], 4)
+            for key in ("size_bytes", "load_ms", "latency_ms", "accuracy")
+        }
+        report.append({"step": step, "skipped": skipped, **metrics, **deltas})
+        LOGGER.info("Compression step %s: %s", step, json.dumps(report[-1]))
+
+    tree_model = is_tree_model(classifier)
+    classifier = compact_trees(classifier)
+    record("compact", skipped=not tree_model)
+    classifier, vectorizer = prune_features(classifier, vectorizer, weights, min_weight)
+    record("prune")
+    classifier, vectorizer = cast_float32(classifier, vectorizer)
+    record("float32")
+    return classifier, vectorizer, report
+
+
+def main(
+    model_dir: Path, output_dir: Path, dataset_path: Path, min_weight: float
+) -> List[Dict[str, float]]:
+    """Compress saved artifacts and score each step on the held-out split."""
+    from modules.preprocessing import preprocess_corpus
+    from modules.serving import write_serving_bundle
+    from modules.train_model import load_dataset, split_dataset
+
+    classifier = load(model_dir / "model.pkl")
+    vectorizer = load(model_dir / "vectorizer.pkl")
+    df = load_dataset(dataset_path)
+    _, X_test, _, y_test = split_dataset(df)
+    texts = preprocess_corpus(X_test)
+    classifier, vectorizer, report = compress(
+        classifier, vectorizer, texts, list(y_test), min_weight
+    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dump(classifier, output_dir / "model.pkl")
+    dump(vectorizer, output_dir / "vectorizer.pkl")
+    write_serving_bundle(output_dir / "model.pkl", output_dir / "vectorizer.pkl")
+    (output_dir / "compression_report.json").write_text(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config import DATA_PATH, MODEL_DIR
+
+    # Pickle CompactTreeEnsemble under its importable name, not __main__.
+    from modules.compression import main
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Compress TrueBot artifacts")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--output", type=Path, default=MODEL_DIR / "compressed")
+    parser.add_argument("--dataset", type=Path, default=DATA_PATH)
+    parser.add_argument("--min-weight", type=float, default=1e-3)
+    args = parser.parse_args()
+    print(
+        json.dumps(
+            main(args.model_dir, args.output, args.dataset, args.min_weight), indent=2
+        )
+    )
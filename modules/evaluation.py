@@ -0,0 +1,283 @@
+"""
+Evaluate saved TrueBot artifacts without retraining.
+
+Loads ``model.pkl``/``vectorizer.pkl`` from a model directory, streams a CSV
+(or the held-out 20% of the training data) in batches, scores the batches
+across worker processes and writes a JSON report. The report holds accuracy,
+precision/recall/F1, a confusion matrix, calibration (Brier score, expected
+calibration error, reliability bins) and bootstrap confidence intervals::
+
+    python -m modules.evaluation --csv data/external.csv --jobs -1 \\
+        --output reports/external.json
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, load
+
+LOGGER = logging.getLogger(__name__)
+
+Batch = Tuple[List[str], np.ndarray]
+
+BOOTSTRAP_CHUNK = 50
+
+
+@lru_cache(maxsize=2)
+def _load_scorer(model_dir: str):
+    from modules.predictor import get_preprocessor
+
+    vectorizer_path = Path(model_dir) / "vectorizer.pkl"
+    return (
+        load(Path(model_dir) / "model.pkl"),
+        load(vectorizer_path),
+        get_preprocessor(vectorizer_path, allow_nltk=True),
+    )
+
+
+def score_batch(model_dir: str, texts: Sequence[str]) -> np.ndarray:
+    """P(real) for a batch; artifacts are loaded once per worker process."""
+    classifier, vectorizer, preprocess = _load_scorer(model_dir)
+    vectorized = vectorizer.transform([preprocess(text) for text in texts])
+    return classifier.predict_proba(vectorized)[:, 1]
+
+
+def csv_batches(path: Path, batch_size: int) -> Iterator[Batch]:
+    """Stream ``text``/``label`` rows, normalizing labels like training does."""
+    from modules.train_model import normalize_labels
+
+    for chunk in pd.read_csv(path, chunksize=batch_size, usecols=["text", "label"]):
+        labels = normalize_labels(chunk["label"])
+        chunk = chunk[chunk["text"].notna() & labels.notna()]
+        labels = labels[chunk.index]
+        yield chunk["text"].astype(str).tolist(), (labels == "real").to_numpy(int)
+
+
+def holdout_batches(dataset_path: Path, batch_size: int) -> Iterator[Batch]:
+    """The 20% test split that ``train_and_evaluate`` held out."""
+    from modules.train_model import load_dataset, split_dataset
+
+    _, X_test, _, y_test = split_dataset(load_dataset(dataset_path))
+    y_test = np.asarray(y_test)
+    for start in range(0, len(X_test), batch_size):
+        yield X_test[start : start + batch_size], y_test[start : start + batch_size]
+
+
+def score_batches(
+    model_dir: Path, batches: Iterator[Batch], n_jobs: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score streamed batches across ``n_jobs`` processes; keep labels in order."""
+    labels: List[np.ndarray] = []
+
+    def texts_only():
+        for texts, batch_labels in batches:
+            labels.append(batch_labels)
+            yield texts
+
+    scores = Parallel(n_jobs=n_jobs, return_as="generator")(
+        delayed(score_batch)(str(model_dir), texts) for texts in texts_only()
+    )
+    proba = list(scores)
+    if not proba:
+        return np.zeros(0), np.zeros(0, dtype=int)
+    return np.concatenate(proba), np.concatenate(labels)
+
+
+def classification_metrics(
+    y_true: np.ndarray, proba: np.ndarray, weights: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """Accuracy, precision/recall/F1 for "real" (1) and Brier score, optionally weighted."""
+    w = np.ones(len(y_true)) if weights is None else weights
+    pred = proba >= 0.5
+    real = y_true == 1
+    tp = np.sum(w * (pred & real))
+    fp = np.sum(w * (pred & ~real))
+    fn = np.sum(w * (~pred & real))
+    total = np.sum(w)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "accuracy": float(np.sum(w * (pred == real)) / total),
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(f1),
+        "brier": float(np.sum(w * (proba - y_true) ** 2) / total),
+    }
+
+
+def calibration(y_true: np.ndarray, proba: np.ndarray, bins: int = 10) -> Dict:
+    """Expected calibration error and reliability bins over P(real)."""
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    index = np.clip(np.digitize(proba, edges[1:-1]), 0, bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    mean_proba = np.bincount(index, weights=proba, minlength=bins)
+    positives = np.bincount(index, weights=y_true, minlength=bins)
+    filled = counts > 0
+    mean_proba[filled] /= counts[filled]
+    positives[filled] /= counts[filled]
+    ece = np.sum(counts[filled] * np.abs(mean_proba - positives)[filled]) / len(proba)
+    return {
+        "ece": round(float(ece), 4),
+        "bins": [
+            {
+                "lower": round(float(edges[i]), 2),
+                "upper": round(float(edges[i + 1]), 2),
+                "count": int(counts[i]),
+                "mean_proba": round(float(mean_proba[i]), 4),
+                "fraction_real": round(float(positives[i]), 4),
+            }
+            for i in range(bins)
+        ],
+    }
+
+
+def _bootstrap_chunk(
+    y_true: np.ndarray, proba: np.ndarray, rounds: int, seed: int
+) -> List[Dict[str, float]]:
+    # Multinomial resampling weights give each bootstrap sample in O(n).
+    rng = np.random.default_rng(seed)
+    n = len(y_true)
+    return [
+        classification_metrics(
+            y_true, proba, np.bincount(rng.integers(0, n, n), minlength=n)
+        )
+        for _ in range(rounds)
+    ]
+
+
+def bootstrap_intervals(
+    y_true: np.ndarray,
+    proba: np.ndarray,
+    rounds: int = 1000,
+    confidence: float = 0.95,
+    n_jobs: int = 1,
+    seed: int = 42,
+) -> Dict[str, Dict[str, float]]:
+    """Percentile bootstrap intervals, with rounds split across ``n_jobs``."""
+    # Fixed-size, individually seeded chunks keep results independent of n_jobs.
+    shares = [
+        min(BOOTSTRAP_CHUNK, rounds - start)
+        for start in range(0, rounds, BOOTSTRAP_CHUNK)
+    ]
+    chunks = Parallel(n_jobs=n_jobs)(
+        delayed(_bootstrap_chunk)(y_true, proba, share, seed + i)
+        for i, share in enumerate(shares)
+    )
+    samples = [sample for chunk in chunks for sample in chunk]
+    alpha = (1 - confidence) / 2 * 100
+    return {
+        metric: {
+            "lower": round(float(np.percentile(values, alpha)), 4),
+            "upper": round(float(np.percentile(values, 100 - alpha)), 4),
+        }
+        for metric, values in (
+            (metric, [sample[metric] for sample in samples]) for metric in samples[0]
+        )
+    }
+
+
+def evaluate(
+    model_dir: Path,
+    batches: Iterator[Batch],
+    n_jobs: int = 1,
+    bootstrap_rounds: int = 1000,
+    calibration_bins: int = 10,
+) -> Dict[str, object]:
+    """Score ``batches`` with saved artifacts and build the full report."""
+    start = time.perf_counter()
+    proba, y_true = score_batches(model_dir, batches, n_jobs)
+    if not len(proba):
+        raise ValueError("No labelled rows to evaluate")
+    scored = time.perf_counter()
+    pred = (proba >= 0.5).astype(int)
+    report = {
+        "model_dir": str(model_dir),
+        "rows": int(len(proba)),
+        "metrics": {
+            key: round(value, 4)
+            for key, value in classification_metrics(y_true, proba).items()
+        },
+        "confusion_matrix": {
+            "true_real": int(np.sum((y_true == 1) & (pred == 1))),
+            "false_real": int(np.sum((y_true == 0) & (pred == 1))),
+            "true_fake": int(np.sum((y_true == 0) & (pred == 0))),
+            "false_fake": int(np.sum((y_true == 1) & (pred == 0))),
+        },
+        "calibration": calibration(y_true, proba, calibration_bins),
+    }
+    if bootstrap_rounds:
+        report["bootstrap"] = {
+            "rounds": bootstrap_rounds,
+            "confidence": 0.95,
+            "intervals": bootstrap_intervals(
+                y_true, proba, bootstrap_rounds, n_jobs=n_jobs
+            ),
+        }
+    report["timing_s"] = {
+        "scoring": round(scored - start, 3),
+        "total": round(time.perf_counter() - start, 3),
+    }
+    return report
+
+
+def main(
+    model_dir: Path,
+    csv_path: Optional[Path],
+    dataset_path: Path,
+    output_path: Optional[Path],
+    n_jobs: int = -1,
+    batch_size: int = 2000,
+    bootstrap_rounds: int = 1000,
+) -> Dict[str, object]:
+    """Evaluate ``csv_path``, or the training hold-out when it is ``None``."""
+    if csv_path is not None:
+        batches = csv_batches(csv_path, batch_size)
+    else:
+        batches = holdout_batches(dataset_path, batch_size)
+    report = evaluate(model_dir, batches, n_jobs, bootstrap_rounds)
+    report["dataset"] = str(csv_path or f"{dataset_path} (held-out 20%)")
+    if output_path is not None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(report, indent=2))
+    LOGGER.info(
+        "Evaluated %d rows in %.2fs", report["rows"], report["timing_s"]["total"]
+    )
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config import DATA_PATH, MODEL_DIR
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Evaluate saved TrueBot artifacts")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument(
+        "--csv", type=Path, help="Labelled CSV; default is the hold-out"
+    )
+    parser.add_argument("--dataset", type=Path, default=DATA_PATH)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--jobs", type=int, default=-1)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--bootstrap", type=int, default=1000)
+    args = parser.parse_args()
+    result = main(
+        args.model_dir,
+        args.csv,
+        args.dataset,
+        args.output,
+        args.jobs,
+        args.batch_size,
+        args.bootstrap,
+    )
+    print(json.dumps({key: result[key] for key in ("rows", "metrics")}, indent=2))
@@ -0,0 +1,65 @@
+"""
+NLTK-free text preprocessing for serving.
+
+Produces the same output as :func:`modules.preprocessing.preprocess_text` using
+only compiled regexes, a stopword ``frozenset`` and a lemma lookup table built
+over the training vocabulary (see ``scripts/build_lemma_table.py``). Tokens
+missing from the table are kept unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+URL_PATTERN = re.compile(r"http\\S+|www\\.\\S+")
+NON_ALPHA_PATTERN = re.compile(r"[^a-z\\s]")
+SPACE_PATTERN = re.compile(r"\\s+")
+
+LemmaTable = Tuple[FrozenSet[str], Dict[str, str]]
+
+
+def clean_text(text: str) -> str:
+    """
+    Perform basic cleanup: lowercase, remove urls, punctuation, digits.
+    """
+    if not text:
+        return ""
+
+    text = text.lower()
+    text = URL_PATTERN.sub(" ", text)
+    text = NON_ALPHA_PATTERN.sub(" ", text)
+    text = SPACE_PATTERN.sub(" ", text)
+    return text.strip()
+
+
+def save_lemma_table(
+    path: Path, stop_words: Iterable[str], lemmas: Dict[str, str]
+) -> None:
+    """Write stopwords and token -> lemma entries as compact JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "stop_words": sorted(set(stop_words)),
+        "lemmas": dict(sorted(lemmas.items())),
+    }
+    path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+
+
+@lru_cache(maxsize=4)
+def load_lemma_table(path: Path) -> LemmaTable:
+    """Load and cache the table written by :func:`save_lemma_table`."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return frozenset(payload["stop_words"]), payload["lemmas"]
+
+
+def preprocess_text(text: str, table: LemmaTable) -> str:
+    """Full pipeline for a single text."""
+    stop_words, lemmas = table
+    return " ".join(
+        lemmas.get(token, token)
+        for token in clean_text(text).split()
+        if token not in stop_words
+    )
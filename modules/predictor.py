@@ -1,44 +1,173 @@
 """
 Prediction helpers for TrueBot.
+
+This module is on the serving path. Predictions come from the
+scikit-learn-free bundle in ``modules/serving.py`` and the NLTK-free lemma
+table. scikit-learn is imported only when the bundle is missing. NLTK is never
+imported: serving without the lemma table is an error.
+``scripts/import_budget.py`` enforces this.
 """
 
 from __future__ import annotations
 
 import logging
+import time
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 from joblib import load
 
-from config import DATA_PATH, MODEL_DIR
-from modules.preprocessing import preprocess_text
-from modules.train_model import main as train_main
+from config import DATA_PATH, LEMMA_TABLE_NAME, MODEL_DIR
+from modules import fast_preprocessing
+from modules.serving import load_serving_bundle
 
 LOGGER = logging.getLogger(__name__)
 
 
 @lru_cache(maxsize=1)
 def load_artifacts(model_path: Path, vectorizer_path: Path):
-    """Load classifier and vectorizer."""
+    """Load classifier and vectorizer, preferring the serving bundle."""
     if not model_path.exists() or not vectorizer_path.exists():
         LOGGER.info("Model artifacts missing. Training new model...")
+        from modules.train_model import main as train_main
+
         train_main(DATA_PATH, MODEL_DIR)
+    bundle = load_serving_bundle(model_path, vectorizer_path)
+    if bundle is not None:
+        return bundle
+    LOGGER.warning(
+        "No serving bundle beside %s; loading scikit-learn artifacts", model_path
+    )
     classifier = load(model_path)
     vectorizer = load(vectorizer_path)
     return classifier, vectorizer
 
 
-def predict_label(text: str, model_path: Path, vectorizer_path: Path) -> Dict[str, str]:
+@lru_cache(maxsize=4)
+def get_preprocessor(
+    vectorizer_path: Path, allow_nltk: bool = False
+) -> Callable[[str], str]:
+    """
+    Preprocess with the lemma lookup table shipped beside the vectorizer.
+
+    A missing table raises :class:`FileNotFoundError`. The NLTK pipeline may
+    download corpora, so a worker must not fall back to it mid-request.
+    Offline tools can pass ``allow_nltk`` to use it for artifacts trained
+    before the table existed.
+    """
+    table_path = vectorizer_path.parent / LEMMA_TABLE_NAME
+    if table_path.exists():
+        table = fast_preprocessing.load_lemma_table(table_path)
+        return lambda text: fast_preprocessing.preprocess_text(text, table)
+    if not allow_nltk:
+        raise FileNotFoundError(
+            f"Lemma table missing at {table_path}; "
+            "build it with scripts/build_lemma_table.py"
+        )
+    LOGGER.warning("Lemma table missing at %s; using NLTK preprocessing", table_path)
+    from modules.preprocessing import preprocess_text
+
+    return preprocess_text
+
+
+@lru_cache(maxsize=1)
+def load_term_weights(
+    model_path: Path, vectorizer_path: Path
+) -> Tuple[np.ndarray, np.ndarray, str]:
+    """
+    Precompute per-feature explanation weights aligned with vocabulary terms.
+
+    Linear models use their class-1 coefficients, so positive weights point
+    towards "Real". Tree models use their cached feature importances, which
+    rank terms but carry no direction.
+    """
+    classifier, vectorizer = load_artifacts(model_path, vectorizer_path)
+    terms = vectorizer.get_feature_names_out()
+    if hasattr(classifier, "coef_"):
+        return terms, np.asarray(classifier.coef_[0], dtype=np.float64), "coefficients"
+    importances = getattr(classifier, "feature_importances_", None)
+    if importances is None:
+        raise TypeError(f"{type(classifier).__name__} exposes no feature weights")
+    return terms, np.asarray(importances, dtype=np.float64), "importances"
+
+
+def top_terms(
+    row, terms: np.ndarray, weights: np.ndarray, top_k: int = 10
+) -> List[Dict[str, float]]:
+    """Rank the non-zero TF-IDF entries of one row by tfidf * weight."""
+    row = row.tocsr()
+    contributions = row.data * weights[row.indices]
+    if top_k < len(contributions):
+        order = np.argpartition(-np.abs(contributions), top_k)[:top_k]
+    else:
+        order = np.arange(len(contributions))
+    order = order[np.argsort(-np.abs(contributions[order]), kind="stable")]
+    return [
+        {
+            "term": str(terms[row.indices[i]]),
+            "weight": round(float(contributions[i]), 4),
+        }
+        for i in order
+        if contributions[i] != 0
+    ]
+
+
+def predict_label(
+    text: str,
+    model_path: Path,
+    vectorizer_path: Path,
+    explain: bool = False,
+    top_k: int = 10,
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, str]:
     """
     Predict whether text is fake or real.
+
+    With ``explain`` the result also lists the ``top_k`` terms that contributed
+    most, read straight from the TF-IDF row that was scored. ``timings``, when
+    given, receives ``scoring_cpu_ms``, the CPU time this thread spent in
+    preprocess, transform and predict_proba. Waiting for the GIL or for a core
+    is not counted. It is omitted when this call had to load the artifacts.
     """
+    cold = load_artifacts.cache_info().currsize == 0
     classifier, vectorizer = load_artifacts(model_path, vectorizer_path)
-    processed = preprocess_text(text)
-    vectorized = vectorizer.transform([processed])
+    preprocess = get_preprocessor(vectorizer_path)
+    start = time.thread_time()
+    vectorized = vectorizer.transform([preprocess(text)])
     proba = classifier.predict_proba(vectorized)[0]
+    if timings is not None and not cold:
+        timings["scoring_cpu_ms"] = (time.thread_time() - start) * 1000
     label = "Real" if proba[1] >= 0.5 else "Fake"
     confidence = max(proba) * 100
     LOGGER.debug("Prediction label=%s confidence=%.2f", label, confidence)
-    return {"label": label, "confidence": round(confidence, 2)}
+    result = {"label": label, "confidence": round(confidence, 2)}
+    if explain:
+        terms, weights, method = load_term_weights(model_path, vectorizer_path)
+        result["explanation"] = {
+            "method": method,
+            "terms": top_terms(vectorized, terms, weights, top_k),
+        }
+    return result
+
 
+WARM_UP_TEXT = "Officials confirmed the figures in a statement on Monday."
+
+
+def warm_up(model_path: Path, vectorizer_path: Path) -> None:
+    """
+    Load artifacts and score one text, so the first request is not the slow one.
+
+    Does nothing when the artifacts are missing, so boot never triggers a
+    retrain. Failures are logged, not raised. Gunicorn stops the whole server
+    when a worker fails to boot, so a bad artifact should only cost a cold or
+    failing first request.
+    """
+    if not model_path.exists() or not vectorizer_path.exists():
+        LOGGER.warning("Skipping warm-up: no artifacts at %s", model_path.parent)
+        return
+    try:
+        predict_label(WARM_UP_TEXT, model_path, vectorizer_path, explain=True)
+    except Exception:
+        LOGGER.exception("Warm-up failed for %s", model_path.parent)
@@ -5,14 +5,16 @@ Text preprocessing utilities for TrueBot.
 from __future__ import annotations
 
 import logging
-import re
-from typing import Iterable, List
+from pathlib import Path
+from typing import Dict, Iterable, List
 
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 from sklearn.feature_extraction.text import TfidfVectorizer
 
+from modules.fast_preprocessing import clean_text, save_lemma_table
+
 LOGGER = logging.getLogger(__name__)
 STOP_WORDS: List[str] = []
 LEMMATIZER = WordNetLemmatizer()
@@ -41,20 +43,6 @@ def init_resources() -> None:
     STOP_WORDS = stopwords.words("english")
 
 
-def clean_text(text: str) -> str:
-    """
-    Perform basic cleanup: lowercase, remove urls, punctuation, digits.
-    """
-    if not text:
-        return ""
-
-    text = text.lower()
-    text = re.sub(r"http\\S+|www\\.\\S+", " ", text)
-    text = re.sub(r"[^a-z\\s]", " ", text)
-    text = re.sub(r"\\s+", " ", text)
-    return text.strip()
-
-
 def lemmatize_tokens(tokens: Iterable[str]) -> List[str]:
     """Lemmatize tokens with fallback."""
     lemmas = []
@@ -75,6 +63,34 @@ def preprocess_text(text: str) -> str:
     return " ".join(lemmas)
 
 
+def build_lemma_table(corpus: Iterable[str]) -> Dict[str, str]:
+    """Map every non-stopword corpus token whose lemma differs to that lemma."""
+    if not STOP_WORDS:
+        init_resources()
+    stop_words = set(STOP_WORDS)
+    tokens = sorted(
+        {
+            token
+            for doc in corpus
+            for token in clean_text(doc).split()
+            if token not in stop_words
+        }
+    )
+    return {
+        token: lemma
+        for token, lemma in zip(tokens, lemmatize_tokens(tokens))
+        if lemma != token
+    }
+
+
+def write_lemma_table(corpus: Iterable[str], path: Path) -> int:
+    """Build the serving lemma table over ``corpus`` and save it to ``path``."""
+    lemmas = build_lemma_table(corpus)
+    save_lemma_table(path, STOP_WORDS, lemmas)
+    LOGGER.info("Wrote %d lemma entries to %s", len(lemmas), path)
+    return len(lemmas)
+
+
 def preprocess_corpus(corpus: Iterable[str]) -> List[str]:
     """Apply preprocess_text to list."""
     return [preprocess_text(doc) for doc in corpus]
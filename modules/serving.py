@@ -0,0 +1,252 @@
+"""
+scikit-learn-free inference artifacts for the web workers.
+
+Unpickling ``model.pkl``/``vectorizer.pkl`` imports scikit-learn, and with it
+scipy.stats, pandas and ``sklearn.metrics``. That costs every worker about a
+second and well over 100 MB before its first prediction. Training therefore
+also writes ``serving.joblib`` beside them. The bundle holds the fitted
+TF-IDF vocabulary and IDF weights, plus either the logistic-regression
+coefficients or a :class:`~modules.compression.CompactTreeEnsemble`. Scoring
+it needs only numpy and scipy.sparse, and it returns the same probabilities
+as the estimators it was exported from.
+
+The bundle records a hash of the pickles it came from. If they are retrained
+or replaced without re-exporting, :func:`load_serving_bundle` ignores the
+stale bundle. Backfill existing artifacts with::
+
+    python -m modules.serving --model-dir model
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from joblib import dump, load
+from scipy.sparse import csr_matrix
+
+from config import SERVING_BUNDLE_NAME
+
+LOGGER = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 1
+
+
+class TfidfFeatures:
+    """The ``transform`` half of a fitted word-level ``TfidfVectorizer``."""
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        ngram_range: Tuple[int, int] = (1, 1),
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        lowercase: bool = True,
+        sublinear_tf: bool = False,
+        norm: Optional[str] = "l2",
+        dtype=np.float64,
+    ) -> None:
+        self.vocabulary_ = vocabulary
+        self.idf_ = np.asarray(idf, dtype=dtype)
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.dtype = dtype
+        self._tokens = re.compile(token_pattern)
+
+    @classmethod
+    def from_sklearn(cls, vectorizer) -> "TfidfFeatures":
+        """Copy the fitted state; reject options this class does not replicate."""
+        unsupported = {
+            "analyzer": vectorizer.analyzer != "word",
+            "tokenizer": vectorizer.tokenizer is not None,
+            "preprocessor": vectorizer.preprocessor is not None,
+            "stop_words": vectorizer.stop_words is not None,
+            "strip_accents": vectorizer.strip_accents is not None,
+            "binary": vectorizer.binary,
+            "use_idf": not vectorizer.use_idf,
+            "norm": vectorizer.norm not in ("l1", "l2", None),
+        }
+        if any(unsupported.values()):
+            options = [name for name, flag in unsupported.items() if flag]
+            raise ValueError(f"Unsupported TfidfVectorizer options: {options}")
+        return cls(
+            {term: int(index) for term, index in vectorizer.vocabulary_.items()},
+            vectorizer.idf_,
+            vectorizer.ngram_range,
+            vectorizer.token_pattern,
+            vectorizer.lowercase,
+            vectorizer.sublinear_tf,
+            vectorizer.norm,
+            vectorizer.dtype,
+        )
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._tokens = re.compile(self.token_pattern)
+
+    def __getstate__(self):
+        return {key: value for key, value in self.__dict__.items() if key != "_tokens"}
+
+    def get_feature_names_out(self) -> np.ndarray:
+        terms = np.empty(len(self.vocabulary_), dtype=object)
+        for term, index in self.vocabulary_.items():
+            terms[index] = term
+        return terms
+
+    def _terms(self, document: str) -> List[str]:
+        if self.lowercase:
+            document = document.lower()
+        tokens = self._tokens.findall(document)
+        min_n, max_n = self.ngram_range
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            terms.extend(
+                " ".join(tokens[start : start + n])
+                for start in range(len(tokens) - n + 1)
+            )
+        return terms
+
+    def transform(self, documents: Iterable[str]) -> csr_matrix:
+        """TF-IDF rows with sorted indices, as ``TfidfVectorizer.transform``."""
+        indptr, indices, counts = [0], [], []
+        for document in documents:
+            row: Dict[int, int] = {}
+            for term in self._terms(document):
+                index = self.vocabulary_.get(term)
+                if index is not None:
+                    row[index] = row.get(index, 0) + 1
+            for index in sorted(row):
+                indices.append(index)
+                counts.append(row[index])
+            indptr.append(len(indices))
+        indices = np.asarray(indices, dtype=np.int32)
+        values = np.asarray(counts, dtype=self.dtype)
+        if self.sublinear_tf:
+            values = np.log(values) + 1
+        values *= self.idf_[indices]
+        matrix = csr_matrix(
+            (values, indices, np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(self.vocabulary_)),
+            dtype=self.dtype,
+        )
+        if self.norm:
+            matrix = _normalize_rows(matrix, self.norm)
+        return matrix
+
+
+def _normalize_rows(matrix: csr_matrix, norm: str) -> csr_matrix:
+    lengths = np.diff(matrix.indptr)
+    rows = np.repeat(np.arange(matrix.shape[0]), lengths)
+    weights = np.abs(matrix.data) if norm == "l1" else matrix.data**2
+    totals = np.bincount(rows, weights=weights, minlength=matrix.shape[0])
+    if norm == "l2":
+        totals = np.sqrt(totals)
+    totals[totals == 0] = 1
+    matrix.data /= totals[rows].astype(matrix.dtype)
+    return matrix
+
+
+class LogisticScorer:
+    """``predict_proba`` of a fitted binary ``LogisticRegression``."""
+
+    def __init__(
+        self, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray
+    ) -> None:
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, model) -> "LogisticScorer":
+        if model.coef_.shape[0] != 1:
+            raise ValueError("Only binary logistic regression is supported")
+        return cls(model.coef_.copy(), model.intercept_.copy(), model.classes_.copy())
+
+    def predict_proba(self, X) -> np.ndarray:
+        margin = np.asarray(X @ self.coef_[0]).ravel() + self.intercept_[0]
+        positive = 1.0 / (1.0 + np.exp(-margin))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+
+def to_serving(classifier, vectorizer):
+    """Convert fitted estimators to their scikit-learn-free counterparts."""
+    from modules.compression import CompactTreeEnsemble, compact_trees, is_tree_model
+
+    if isinstance(classifier, CompactTreeEnsemble) or is_tree_model(classifier):
+        scorer = compact_trees(classifier)
+    elif hasattr(classifier, "coef_"):
+        scorer = LogisticScorer.from_sklearn(classifier)
+    else:
+        raise ValueError(f"No serving export for {type(classifier).__name__}")
+    return scorer, TfidfFeatures.from_sklearn(vectorizer)
+
+
+def _fingerprint(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_serving_bundle(model_path: Path, vectorizer_path: Path) -> Path:
+    """Export the saved pickles to ``serving.joblib`` in the same directory."""
+    scorer, features = to_serving(load(model_path), load(vectorizer_path))
+    path = model_path.parent / SERVING_BUNDLE_NAME
+    dump(
+        {
+            "version": BUNDLE_VERSION,
+            "sources": {
+                "model": _fingerprint(model_path),
+                "vectorizer": _fingerprint(vectorizer_path),
+            },
+            "classifier": scorer,
+            "vectorizer": features,
+        },
+        path,
+    )
+    LOGGER.info("Wrote serving bundle %s", path)
+    return path
+
+
+def load_serving_bundle(model_path: Path, vectorizer_path: Path):
+    """Return ``(classifier, vectorizer)`` from the bundle, or ``None`` if unusable."""
+    path = model_path.parent / SERVING_BUNDLE_NAME
+    if not path.exists():
+        return None
+    bundle = load(path)
+    expected = {
+        "model": _fingerprint(model_path),
+        "vectorizer": _fingerprint(vectorizer_path),
+    }
+    if bundle.get("version") != BUNDLE_VERSION or bundle.get("sources") != expected:
+        LOGGER.warning("Ignoring stale serving bundle %s", path)
+        return None
+    return bundle["classifier"], bundle["vectorizer"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from config import MODEL_DIR
+
+    # Pickle the bundle classes under their importable names, not __main__.
+    from modules.serving import write_serving_bundle
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export the serving bundle")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    args = parser.parse_args()
+    write_serving_bundle(
+        args.model_dir / "model.pkl", args.model_dir / "vectorizer.pkl"
+    )
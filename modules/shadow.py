@@ -0,0 +1,322 @@
+"""
+Shadow evaluation of a candidate model on live traffic.
+
+The model registry has two slots. The active model lives in ``model/``. A
+candidate is staged in ``model/shadow/``, for example with
+``python -m modules.train_model --model-dir model/shadow``. When a candidate
+is present, ``/predict`` hands a copy of each request to
+:class:`ShadowEvaluator`. A separate worker process scores it, so the
+response never waits on the candidate, and live requests do not compete with
+it for the GIL. The evaluator records:
+
+- how often the two models agree,
+- how far apart their P(real) estimates are,
+- each model's per-request scoring CPU time (preprocess, transform and
+  ``predict_proba``; the first, cold call of each model is not counted).
+
+CPU time, not wall-clock time, is compared. The active model shares its
+process with other request threads, and the candidate runs at low priority,
+so both wall-clock figures would mostly measure waiting.
+
+``GET /shadow/stats`` serves these figures. ``python -m modules.shadow promote``
+moves the candidate into the active slot and keeps the old model in
+``model/previous/``. Workers keep serving the model they loaded until they
+restart.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from config import LEMMA_TABLE_NAME, SERVING_BUNDLE_NAME
+
+LOGGER = logging.getLogger(__name__)
+
+# Tells a collector thread that its worker process is gone.
+_STOP_COLLECTOR = "stop"
+
+ARTIFACT_NAMES = ("model.pkl", "vectorizer.pkl", LEMMA_TABLE_NAME, SERVING_BUNDLE_NAME)
+
+
+def has_artifacts(model_dir: Path) -> bool:
+    return (model_dir / "model.pkl").exists() and (
+        model_dir / "vectorizer.pkl"
+    ).exists()
+
+
+def promote_shadow(active_dir: Path, shadow_dir: Path) -> Path:
+    """Move the shadow candidate into the active slot; return the backup dir."""
+    if not has_artifacts(shadow_dir):
+        raise FileNotFoundError(f"No candidate model staged in {shadow_dir}")
+    backup_dir = active_dir / "previous"
+    if backup_dir.exists():
+        shutil.rmtree(backup_dir)
+    backup_dir.mkdir(parents=True)
+    for name in ARTIFACT_NAMES:
+        if (active_dir / name).exists():
+            shutil.move(str(active_dir / name), backup_dir / name)
+        if (shadow_dir / name).exists():
+            shutil.move(str(shadow_dir / name), active_dir / name)
+    LOGGER.info(
+        "Promoted %s to %s (previous model in %s)", shadow_dir, active_dir, backup_dir
+    )
+    return backup_dir
+
+
+def _p_real(prediction: Dict) -> float:
+    confidence = prediction["confidence"] / 100
+    return confidence if prediction["label"] == "Real" else 1 - confidence
+
+
+def _percentiles(values) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(np.fromiter(values, float), [50, 95, 99])
+    return {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3)}
+
+
+def _delta_summary(values) -> Dict[str, float]:
+    deltas = np.fromiter(values, float)
+    if not len(deltas):
+        return {"mean": 0.0, "mean_abs": 0.0, "max_abs": 0.0}
+    return {
+        "mean": round(float(deltas.mean()), 4),
+        "mean_abs": round(float(np.abs(deltas).mean()), 4),
+        "max_abs": round(float(np.abs(deltas).max()), 4),
+    }
+
+
+def _load_candidate(shadow_dir: Path):
+    from joblib import load
+
+    from modules.predictor import get_preprocessor
+    from modules.serving import load_serving_bundle
+
+    # Same loading path as the active model, so latencies compare like for like.
+    model_path = shadow_dir / "model.pkl"
+    vectorizer_path = shadow_dir / "vectorizer.pkl"
+    classifier, vectorizer = load_serving_bundle(model_path, vectorizer_path) or (
+        load(model_path),
+        load(vectorizer_path),
+    )
+    return classifier, vectorizer, get_preprocessor(vectorizer_path)
+
+
+def _score_copies(shadow_dir: Path, requests, results) -> None:
+    """Worker process: score queued copies until a ``None`` sentinel arrives."""
+    # Lowest CPU priority, so on a small box live requests win the CPU.
+    if hasattr(os, "nice"):
+        os.nice(19)
+    model = None
+    while True:
+        item = requests.get()
+        if item is None:
+            return
+        text, active = item
+        try:
+            cold = model is None
+            if cold:
+                model = _load_candidate(shadow_dir)
+            classifier, vectorizer, preprocess = model
+            start = time.thread_time()
+            p_real = float(
+                classifier.predict_proba(vectorizer.transform([preprocess(text)]))[0][1]
+            )
+            shadow_ms = None if cold else (time.thread_time() - start) * 1000
+            results.put((active, p_real, shadow_ms))
+        except Exception:  # pragma: no cover - never let the worker die
+            LOGGER.exception("Shadow scoring failed")
+            results.put(None)
+
+
+class ShadowEvaluator:
+    """Score copies of live requests with a candidate model in a worker process."""
+
+    def __init__(
+        self,
+        shadow_dir: Path,
+        queue_size: int = 1000,
+        sample_rate: float = 1.0,
+        window: int = 10_000,
+    ) -> None:
+        self.shadow_dir = shadow_dir
+        # Checked once: staging a candidate takes effect on worker restart.
+        self.enabled = has_artifacts(shadow_dir)
+        self.sample_rate = sample_rate
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._requests = None
+        self._results = None
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._generation = 0
+        self._counts = {"submitted": 0, "dropped": 0, "scored": 0, "errors": 0}
+        self._agreements = 0
+        self._deltas: Deque[float] = deque(maxlen=window)
+        self._active_cpu_ms: Deque[float] = deque(maxlen=window)
+        self._shadow_cpu_ms: Deque[float] = deque(maxlen=window)
+
+    def submit(
+        self, text: str, prediction: Dict, latency_ms: Optional[float] = None
+    ) -> bool:
+        """
+        Queue a copy of a served request; never blocks the caller.
+
+        ``latency_ms`` is the active model's scoring CPU time
+        (``scoring_cpu_ms`` from :func:`~modules.predictor.predict_label`), or
+        ``None`` when the call also loaded the artifacts.
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        self._ensure_worker()
+        active: Tuple[str, float, Optional[float]] = (
+            prediction["label"],
+            _p_real(prediction),
+            latency_ms,
+        )
+        try:
+            self._requests.put_nowait((text, active))
+        except queue.Full:
+            with self._lock:
+                self._counts["dropped"] += 1
+            return False
+        with self._lock:
+            self._counts["submitted"] += 1
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        """Agreement, P(real) deltas and scoring CPU time, active vs. candidate."""
+        with self._lock:
+            scored = self._counts["scored"]
+            return {
+                "shadow_dir": str(self.shadow_dir),
+                "enabled": self.enabled,
+                **self._counts,
+                "queue_depth": self._pending(),
+                "agreement_rate": (
+                    round(self._agreements / scored, 4) if scored else None
+                ),
+                "p_real_delta": _delta_summary(self._deltas),
+                "scoring_cpu_ms": {
+                    "active": _percentiles(self._active_cpu_ms),
+                    "shadow": _percentiles(self._shadow_cpu_ms),
+                },
+            }
+
+    def drain(self, timeout: float = 5.0) -> None:
+        """Wait until queued copies are scored (used by tests and shutdown)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._pending():
+                    return
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        """Stop the worker process after it finishes the queued copies."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None:
+            self._requests.put(None)
+            process.join(timeout=5)
+            self._results.put(_STOP_COLLECTOR)
+
+    def _pending(self) -> int:
+        counts = self._counts
+        return counts["submitted"] - counts["scored"] - counts["errors"]
+
+    def _ensure_worker(self) -> None:
+        # Started lazily so each gunicorn worker process gets its own scorer.
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            if self._process is not None:
+                self._abandon_worker()
+            # spawn, not fork: the serving process may already run threads.
+            context = multiprocessing.get_context("spawn")
+            self._generation += 1
+            self._requests = context.Queue(maxsize=self.queue_size)
+            self._results = context.Queue()
+            self._process = context.Process(
+                target=_score_copies,
+                args=(self.shadow_dir, self._requests, self._results),
+                name="shadow-evaluator",
+                daemon=True,
+            )
+            self._process.start()
+            threading.Thread(
+                target=self._collect,
+                args=(self._results, self._generation),
+                name="shadow-collector",
+                daemon=True,
+            ).start()
+
+    def _abandon_worker(self) -> None:
+        # The scorer died, so the copies still in flight will never come back.
+        # Count them as errors and stop the old collector, or queue_depth would
+        # stay inflated and drain() would always wait out its timeout.
+        lost = self._pending()
+        LOGGER.warning(
+            "Shadow worker exited with code %s; %d queued copies lost",
+            self._process.exitcode,
+            lost,
+        )
+        self._counts["errors"] += lost
+        self._requests.cancel_join_thread()
+        self._results.put(_STOP_COLLECTOR)
+
+    def _collect(self, results, generation: int) -> None:
+        # Only bookkeeping runs in the serving process.
+        while True:
+            result = results.get()
+            if result == _STOP_COLLECTOR:
+                return
+            with self._lock:
+                if generation != self._generation:
+                    continue  # already counted when the worker was replaced
+                if result is None:
+                    self._counts["errors"] += 1
+                    continue
+                (label, active_p_real, active_ms), p_real, shadow_ms = result
+                self._counts["scored"] += 1
+                self._agreements += ("Real" if p_real >= 0.5 else "Fake") == label
+                self._deltas.append(p_real - active_p_real)
+                if active_ms is not None:
+                    self._active_cpu_ms.append(active_ms)
+                if shadow_ms is not None:
+                    self._shadow_cpu_ms.append(shadow_ms)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from config import MODEL_DIR, SHADOW_MODEL_DIR
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Manage the shadow model slot")
+    parser.add_argument("command", choices=("status", "promote"))
+    args = parser.parse_args()
+    if args.command == "promote":
+        promote_shadow(MODEL_DIR, SHADOW_MODEL_DIR)
+    print(
+        json.dumps(
+            {
+                "active": str(MODEL_DIR),
+                "shadow": str(SHADOW_MODEL_DIR),
+                "shadow_staged": has_artifacts(SHADOW_MODEL_DIR),
+            },
+            indent=2,
+        )
+    )
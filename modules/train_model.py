@@ -7,7 +7,7 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -17,18 +17,191 @@ from sklearn.metrics import accuracy_score, classification_report
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 
-from modules.preprocessing import build_vectorizer, preprocess_corpus
+from config import LEMMA_TABLE_NAME
+from modules.preprocessing import build_vectorizer, preprocess_corpus, write_lemma_table
+from modules.serving import write_serving_bundle
 
 logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger("train_model")
 
 
-def load_dataset(path: Path) -> pd.DataFrame:
-    """Read dataset CSV."""
-    df = pd.read_csv(path)
-    if "text" not in df.columns or "label" not in df.columns:
-        raise ValueError("Dataset must contain 'text' and 'label' columns")
-    return df.dropna(subset=["text", "label"])
+LABEL_ALIASES = {
+    "real": "real",
+    "true": "real",
+    "reliable": "real",
+    "1": "real",
+    "fake": "fake",
+    "false": "fake",
+    "unreliable": "fake",
+    "0": "fake",
+}
+CLEANING_RULES = (
+    "missing",
+    "invalid_label",
+    "too_short",
+    "too_long",
+    "exact_duplicates",
+    "near_duplicates",
+    "label_conflicts",
+)
+
+
+def normalize_labels(labels: pd.Series) -> pd.Series:
+    """
+    Map raw labels to "real"/"fake" through ``LABEL_ALIASES``; NaN otherwise.
+
+    Numeric labels are compared as integers, so a float column read from a CSV
+    with gaps (``1.0``/``0.0``) matches the ``"1"``/``"0"`` aliases.
+    """
+    # Labels have few distinct values; normalise those and map back.
+    uniques = pd.Series(labels.unique())
+    keys = uniques.astype(str).str.strip().str.lower()
+    numeric = pd.to_numeric(uniques, errors="coerce")
+    integral = numeric.notna() & (numeric == numeric.round())
+    keys = keys.mask(integral, numeric[integral].astype("int64").astype(str))
+    return labels.map(dict(zip(uniques, keys.map(LABEL_ALIASES))))
+
+
+def normalize_text(texts: pd.Series) -> pd.Series:
+    """Lowercase, replace non-alphanumerics with spaces and collapse whitespace."""
+    return texts.str.lower().str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+
+
+def near_duplicate_signature(normalized: pd.Series) -> pd.Series:
+    """Digit-free sorted token set, so reordered or renumbered copies collide."""
+    tokens = normalized.str.replace(r"[0-9]+", " ", regex=True).str.split()
+    return tokens.map(lambda words: " ".join(sorted(set(words))))
+
+
+def _hash(values: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+# Seen hashes are kept as sorted uint64 arrays: 8 bytes per row and
+# vectorized lookups, instead of a Python int object and set slot per row.
+def _contains(seen: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Membership of ``values`` in the sorted array ``seen``."""
+    if not len(seen):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(seen, values), len(seen) - 1)
+    return seen[positions] == values
+
+
+def _add(seen: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Insert ``values`` missing from ``seen``, keeping it sorted."""
+    values = np.unique(values)
+    return np.insert(seen, np.searchsorted(seen, values), values)
+
+
+def _unseen(hashes: np.ndarray, *seen: np.ndarray) -> np.ndarray:
+    """Mask of first occurrences, within the chunk and across earlier chunks."""
+    mask = ~pd.Series(hashes).duplicated().to_numpy()
+    for previous in seen:
+        mask &= ~_contains(previous, hashes)
+    return mask
+
+
+def _label_conflicts(
+    hashes: np.ndarray, labels: np.ndarray, seen: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """Hashes carrying both labels, within the chunk or against earlier chunks."""
+    pairs = pd.DataFrame({"hash": hashes, "label": labels}).drop_duplicates()
+    values = pairs["hash"].to_numpy()
+    labels = pairs["label"].to_numpy()
+    conflicting = pairs["hash"].duplicated(keep=False).to_numpy()
+    for label, other in (("real", "fake"), ("fake", "real")):
+        conflicting = conflicting | (labels == label) & _contains(seen[other], values)
+    return values[conflicting]
+
+
+def load_dataset(
+    path: Path,
+    chunksize: int = 100_000,
+    dedup: bool = True,
+    near_dedup: bool = False,
+    min_chars: int = 20,
+    max_chars: int | None = None,
+) -> pd.DataFrame:
+    """
+    Read dataset CSV in chunks and clean it.
+
+    Rows are dropped in this order:
+
+    - missing text or label
+    - labels outside ``LABEL_ALIASES``
+    - normalized text outside ``[min_chars, max_chars]``
+    - exact duplicates of the normalized text (when ``dedup``)
+    - near duplicates (when ``near_dedup``)
+
+    Texts seen with both labels are dropped entirely. Per-rule counts are
+    logged and stored in ``df.attrs["cleaning_report"]``.
+    """
+    report = {"rows_read": 0, **{rule: 0 for rule in CLEANING_RULES}}
+    # Exact hashes are kept per label; a hash found under the other label is
+    # a conflict.
+    empty = np.empty(0, dtype=np.uint64)
+    seen_exact = {"real": empty, "fake": empty}
+    seen_near = empty
+    conflicts: List[np.ndarray] = []
+    kept = []
+
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        if "text" not in chunk.columns or "label" not in chunk.columns:
+            raise ValueError("Dataset must contain 'text' and 'label' columns")
+        report["rows_read"] += len(chunk)
+        chunk = _drop(
+            chunk, chunk["text"].notna() & chunk["label"].notna(), "missing", report
+        )
+
+        chunk = chunk.assign(label=normalize_labels(chunk["label"]))
+        chunk = _drop(chunk, chunk["label"].notna(), "invalid_label", report)
+
+        normalized = normalize_text(chunk["text"].astype(str))
+        lengths = normalized.str.len()
+        chunk = _drop(chunk, lengths >= min_chars, "too_short", report)
+        normalized = normalized[chunk.index]
+        if max_chars is not None:
+            chunk = _drop(chunk, normalized.str.len() <= max_chars, "too_long", report)
+            normalized = normalized[chunk.index]
+
+        hashes = _hash(normalized)
+        if dedup:
+            labels = chunk["label"].to_numpy()
+            conflicts.append(_label_conflicts(hashes, labels, seen_exact))
+            mask = _unseen(hashes, *seen_exact.values())
+            chunk = _drop(chunk, mask, "exact_duplicates", report)
+            normalized = normalized[chunk.index]
+            hashes, labels = hashes[mask], labels[mask]
+            for label in seen_exact:
+                seen_exact[label] = _add(seen_exact[label], hashes[labels == label])
+        if near_dedup:
+            signatures = _hash(near_duplicate_signature(normalized))
+            mask = _unseen(signatures, seen_near)
+            seen_near = _add(seen_near, signatures[mask])
+            chunk = _drop(chunk, mask, "near_duplicates", report)
+            hashes = hashes[mask]
+        kept.append(chunk.assign(_hash=hashes))
+
+    df = (
+        pd.concat(kept, ignore_index=True)
+        if kept
+        else pd.DataFrame(columns=["text", "label", "_hash"])
+    )
+    conflicting = np.concatenate(conflicts) if conflicts else empty
+    if len(conflicting):
+        keep = ~np.isin(df["_hash"].to_numpy(dtype=np.uint64), conflicting)
+        df = _drop(df, keep, "label_conflicts", report)
+    df = df.drop(columns="_hash").reset_index(drop=True)
+    report["rows_kept"] = len(df)
+    LOGGER.info("Dataset cleaning report: %s", json.dumps(report))
+    df.attrs["cleaning_report"] = report
+    return df
+
+
+def _drop(df: pd.DataFrame, keep, rule: str, report: Dict[str, int]) -> pd.DataFrame:
+    keep = np.asarray(keep, dtype=bool)
+    report[rule] += int((~keep).sum())
+    return df[keep]
 
 
 def build_models() -> Dict[str, Pipeline]:
@@ -72,13 +245,19 @@ def build_models() -> Dict[str, Pipeline]:
     return models
 
 
-def train_and_evaluate(df: pd.DataFrame) -> Tuple[Pipeline, Dict[str, float]]:
-    """Train candidate models and return best."""
-    X = preprocess_corpus(df["text"].tolist())
+def split_dataset(df: pd.DataFrame):
+    """Stratified 80/20 split of raw texts and binary labels (1 = real)."""
     y = (df["label"].str.lower() == "real").astype(int)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
+    return train_test_split(
+        df["text"].tolist(), y, test_size=0.2, random_state=42, stratify=y
     )
+
+
+def train_and_evaluate(df: pd.DataFrame) -> Tuple[Pipeline, Dict[str, float]]:
+    """Train candidate models and return best."""
+    X_train, X_test, y_train, y_test = split_dataset(df)
+    X_train = preprocess_corpus(X_train)
+    X_test = preprocess_corpus(X_test)
     scores: Dict[str, float] = {}
     reports: Dict[str, str] = {}
     best_model: Pipeline | None = None
@@ -112,6 +291,10 @@ def persist_model(pipeline: Pipeline, model_dir: Path) -> None:
     classifier = pipeline.named_steps["clf"]
     dump(classifier, model_dir / "model.pkl")
     dump(vectorizer, model_dir / "vectorizer.pkl")
+    try:
+        write_serving_bundle(model_dir / "model.pkl", model_dir / "vectorizer.pkl")
+    except ValueError as exc:
+        LOGGER.warning("No serving bundle; workers will load scikit-learn: %s", exc)
 
 
 def main(dataset_path: Path, model_dir: Path) -> Dict[str, float]:
@@ -119,13 +302,22 @@ def main(dataset_path: Path, model_dir: Path) -> Dict[str, float]:
     df = load_dataset(dataset_path)
     pipeline, scores = train_and_evaluate(df)
     persist_model(pipeline, model_dir)
+    write_lemma_table(df["text"].tolist(), model_dir / LEMMA_TABLE_NAME)
     return scores
 
 
 if __name__ == "__main__":
+    import argparse
+
     from config import DATA_PATH, MODEL_DIR
 
-    metrics = main(DATA_PATH, MODEL_DIR)
+    parser = argparse.ArgumentParser(description="Train TrueBot models")
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=MODEL_DIR,
+        help="Where to write artifacts, e.g. model/shadow for a candidate",
+    )
+    args = parser.parse_args()
+    metrics = main(DATA_PATH, args.model_dir)
     print(json.dumps(metrics, indent=2))
-
-
@@ -0,0 +1,42 @@
+"""
+Build the serving lemma table for existing model artifacts.
+
+Training writes ``model/lemmas.json`` already; use this script to add it to
+artifacts trained before the table existed. The script also checks that the
+NLTK-free preprocessor matches the NLTK pipeline on every training text.
+"""
+
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import DATA_PATH, LEMMA_TABLE_PATH  # noqa: E402
+from modules import fast_preprocessing, preprocessing  # noqa: E402
+from modules.train_model import load_dataset  # noqa: E402
+
+
+def main(dataset_path: Path = DATA_PATH, output_path: Path = LEMMA_TABLE_PATH) -> None:
+    texts = load_dataset(dataset_path)["text"].tolist()
+    entries = preprocessing.write_lemma_table(texts, output_path)
+    table = fast_preprocessing.load_lemma_table(output_path)
+    mismatches = [
+        text
+        for text in texts
+        if fast_preprocessing.preprocess_text(text, table)
+        != preprocessing.preprocess_text(text)
+    ]
+    if mismatches:
+        raise SystemExit(
+            f"{len(mismatches)} texts differ from the NLTK pipeline, "
+            f"e.g. {mismatches[0]!r}"
+        )
+    size = output_path.stat().st_size
+    print(f"Wrote {entries} lemma entries ({size} bytes) to {output_path}")
+    print(f"Verified identical output on {len(texts)} training texts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Check that a web worker boots cheaply and serves without training code.
+
+Each gunicorn worker imports ``app`` and then warms the model (see
+``gunicorn.conf.py``). The probe does the same in a fresh interpreter: it
+imports ``app``, loads the artifacts from ``--model-dir`` and scores one text.
+At that point, it checks which modules are loaded. The training-only
+dependencies (pandas, the scikit-learn ensembles and metrics, NLTK, xgboost
+and ``modules.train_model``) must not be among them. The import time, the
+warm-up time and the resident-set growth must also stay within budget::
+
+    python scripts/import_budget.py --model-dir model --max-ms 800 --max-mb 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import MODEL_DIR  # noqa: E402
+
+FORBIDDEN_MODULES = (
+    "pandas",
+    "sklearn.ensemble",
+    "sklearn.metrics",
+    "nltk",
+    "xgboost",
+    "modules.train_model",
+)
+DEFAULT_MAX_MS = 800.0
+DEFAULT_MAX_WARM_MS = 500.0
+DEFAULT_MAX_MB = 100.0
+
+_PROBE = """
+import json, resource, sys, time
+from pathlib import Path
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+from modules.predictor import warm_up
+model_dir = Path({model_dir!r})
+warm_up(model_dir / "model.pkl", model_dir / "vectorizer.pkl")
+warmed = time.perf_counter()
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "warm_ms": (warmed - imported) * 1000,
+    "rss_mb": (after - before) / 1024,
+    "loaded": [name for name in {forbidden!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(
+    module: str = "app", model_dir: Path = MODEL_DIR, runs: int = 3
+) -> Dict[str, object]:
+    """Boot and warm up in ``runs`` fresh interpreters; keep the fastest run."""
+    probe = _PROBE.format(
+        module=module, model_dir=str(model_dir), forbidden=FORBIDDEN_MODULES
+    )
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True
+        )
+        if completed.returncode:
+            raise RuntimeError(f"Probe failed:\n{completed.stderr}")
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    best = min(samples, key=lambda sample: sample["import_ms"] + sample["warm_ms"])
+    return {
+        "module": module,
+        "import_ms": round(best["import_ms"], 1),
+        "warm_ms": round(best["warm_ms"], 1),
+        "rss_mb": round(max(sample["rss_mb"] for sample in samples), 1),
+        "forbidden_loaded": sorted({n for s in samples for n in s["loaded"]}),
+    }
+
+
+def check_budget(
+    result: Dict[str, object],
+    max_ms: float = DEFAULT_MAX_MS,
+    max_warm_ms: float = DEFAULT_MAX_WARM_MS,
+    max_mb: float = DEFAULT_MAX_MB,
+) -> List[str]:
+    """Return a description of every budget ``result`` exceeds."""
+    problems = []
+    if result["forbidden_loaded"]:
+        problems.append(
+            "training-only modules on the serving path: "
+            + ", ".join(result["forbidden_loaded"])
+        )
+    if result["import_ms"] > max_ms:
+        problems.append(f"import took {result['import_ms']} ms (budget {max_ms} ms)")
+    if result["warm_ms"] > max_warm_ms:
+        problems.append(
+            f"warm-up took {result['warm_ms']} ms (budget {max_warm_ms} ms)"
+        )
+    if result["rss_mb"] > max_mb:
+        problems.append(f"boot grew RSS by {result['rss_mb']} MB (budget {max_mb} MB)")
+    return problems
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serving import-time budget")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS)
+    parser.add_argument("--max-warm-ms", type=float, default=DEFAULT_MAX_WARM_MS)
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB)
+    args = parser.parse_args(argv)
+    result = measure_import(args.module, args.model_dir, args.runs)
+    print(json.dumps(result, indent=2))
+    problems = check_budget(result, args.max_ms, args.max_warm_ms, args.max_mb)
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,505 @@
+"""
+Replay recorded news texts against a locally started TrueBot app.
+
+Texts come from ``data/news.csv`` (the default) or the ``manual_inputs``
+table. An app started by the script writes to a scratch copy of the database,
+so load runs never add their own traffic to ``manual_inputs``. The script can
+start the Flask dev server or gunicorn, with any worker count and
+worker class. It then steps through a list of load levels, either open loop
+(fixed request rate) or closed loop (fixed concurrency), and sends a mix of
+``/detect`` form posts and ``/predict`` JSON calls::
+
+    python scripts/load_test.py --server gunicorn --workers 4 --mode open \\
+        --levels 5,10,20,40 --duration 20 --predict-ratio 0.7 --output load.json
+
+For each level it reports throughput, latency percentiles and error rate. It
+also reports the saturation point: the first level the app could not sustain.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import DATA_PATH, DB_PATH  # noqa: E402
+
+PERCENTILES = (50, 90, 95, 99)
+# Default spread for launched apps, so per-client rate limits never trip and
+# the sweep measures server capacity.
+LAUNCHED_APP_CLIENTS = 10_000
+
+
+@dataclass
+class RequestResult:
+    endpoint: str
+    status: int
+    latency_ms: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 400
+
+
+def load_texts(source: str, limit: int = 1000, db_path: Path = DB_PATH) -> List[str]:
+    """
+    Read replay texts from ``manual_inputs`` ("manual") or the dataset CSV ("csv").
+
+    An empty or missing ``manual_inputs`` table falls back to the CSV.
+    """
+    if source == "manual":
+        if not db_path.exists():
+            return load_texts("csv", limit)
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(
+                "SELECT text FROM manual_inputs WHERE text IS NOT NULL "
+                "ORDER BY id DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        finally:
+            conn.close()
+        texts = [row[0] for row in rows if row[0] and row[0].strip()]
+        if not texts:
+            print("manual_inputs is empty; replaying data/news.csv", file=sys.stderr)
+            return load_texts("csv", limit)
+    elif source == "csv":
+        texts = []
+        with DATA_PATH.open(newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                if row.get("text", "").strip():
+                    texts.append(row["text"])
+                if len(texts) >= limit:
+                    break
+    else:
+        raise ValueError(f"Unknown text source '{source}'")
+    if not texts:
+        raise RuntimeError(f"No texts found in source '{source}'")
+    return texts
+
+
+def send_request(
+    base_url: str,
+    endpoint: str,
+    text: str,
+    timeout: float,
+    client: Optional[str] = None,
+) -> RequestResult:
+    """Issue one ``/detect`` form post or ``/predict`` JSON call."""
+    if endpoint == "/predict":
+        body = json.dumps({"text": text}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+    else:
+        body = urllib.parse.urlencode({"news_text": text}).encode("utf-8")
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    if client:
+        # Lets one load generator stand in for many rate-limited clients.
+        headers["X-Forwarded-For"] = client
+    req = urllib.request.Request(base_url + endpoint, data=body, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+        error = None
+    except urllib.error.HTTPError as exc:
+        status, error = exc.code, f"HTTP {exc.code}"
+    except (urllib.error.URLError, OSError) as exc:
+        status, error = 0, type(exc).__name__
+    return RequestResult(endpoint, status, (time.perf_counter() - start) * 1000, error)
+
+
+def _pick(rng: random.Random, texts: Sequence[str], predict_ratio: float, clients: int):
+    endpoint = "/predict" if rng.random() < predict_ratio else "/detect"
+    text = rng.choice(texts)
+    if not clients:
+        return endpoint, text, None
+    idx = rng.randrange(clients)
+    return endpoint, text, f"10.{idx >> 16 & 255}.{idx >> 8 & 255}.{idx & 255}"
+
+
+def run_open_loop(
+    base_url: str,
+    texts: Sequence[str],
+    rate: float,
+    duration: float,
+    predict_ratio: float = 0.5,
+    timeout: float = 10.0,
+    max_inflight: int = 256,
+    seed: int = 42,
+    clients: int = 0,
+) -> List[RequestResult]:
+    """
+    Send requests on a fixed schedule of ``rate`` per second.
+
+    Latency is measured from the scheduled send time. Queueing delay on the
+    client side is therefore counted, so the numbers do not suffer from
+    coordinated omission.
+    """
+    rng = random.Random(seed)
+    results: List[RequestResult] = []
+    lock = threading.Lock()
+    total = max(1, int(rate * duration))
+
+    def fire(scheduled: float, endpoint: str, text: str, client) -> None:
+        result = send_request(base_url, endpoint, text, timeout, client)
+        result.latency_ms = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            results.append(result)
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        start = time.perf_counter()
+        for index in range(total):
+            scheduled = start + index / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, scheduled, *_pick(rng, texts, predict_ratio, clients))
+    return results
+
+
+def run_closed_loop(
+    base_url: str,
+    texts: Sequence[str],
+    concurrency: int,
+    duration: float,
+    predict_ratio: float = 0.5,
+    timeout: float = 10.0,
+    seed: int = 42,
+    clients: int = 0,
+) -> List[RequestResult]:
+    """Keep ``concurrency`` clients busy, each sending back-to-back requests."""
+    results: List[RequestResult] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(worker: int) -> None:
+        rng = random.Random(f"{seed}-{worker}")
+        while time.perf_counter() < deadline:
+            endpoint, text, ip = _pick(rng, texts, predict_ratio, clients)
+            result = send_request(base_url, endpoint, text, timeout, ip)
+            with lock:
+                results.append(result)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(results: Sequence[RequestResult], elapsed: float) -> Dict[str, object]:
+    """Aggregate one load level into throughput, latency and error figures."""
+    latencies = [r.latency_ms for r in results if r.ok]
+    errors = sum(1 for r in results if not r.ok)
+    by_endpoint: Dict[str, int] = {}
+    by_status: Dict[str, int] = {}
+    for result in results:
+        by_endpoint[result.endpoint] = by_endpoint.get(result.endpoint, 0) + 1
+        by_status[str(result.status)] = by_status.get(str(result.status), 0) + 1
+    return {
+        "requests": len(results),
+        "throughput_rps": (
+            round((len(results) - errors) / elapsed, 2) if elapsed else 0.0
+        ),
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "latency_ms": {
+            **{f"p{pct}": round(percentile(latencies, pct), 2) for pct in PERCENTILES},
+            "max": round(max(latencies), 2) if latencies else 0.0,
+        },
+        "endpoints": by_endpoint,
+        "statuses": by_status,
+    }
+
+
+def find_saturation(
+    steps: Sequence[Dict[str, object]],
+    mode: str,
+    slo_p99_ms: float,
+    max_error_rate: float = 0.01,
+    min_efficiency: float = 0.9,
+) -> Optional[Dict[str, object]]:
+    """
+    Return the first level the app could not sustain, or ``None``.
+
+    A level is saturated when p99 is over the SLO or the error rate is over
+    budget. It is also saturated when throughput stops keeping up. In open
+    loop that means below ``min_efficiency`` of the target rate. In closed
+    loop it means the extra clients gave less than 10% more throughput.
+    """
+    previous: Optional[Dict[str, object]] = None
+    for step in steps:
+        throughput = step["throughput_rps"]
+        if (
+            step["latency_ms"]["p99"] > slo_p99_ms
+            or step["error_rate"] > max_error_rate
+        ):
+            return step
+        if mode == "open" and throughput < min_efficiency * step["level"]:
+            return step
+        if (
+            mode == "closed"
+            and previous is not None
+            and throughput < previous["throughput_rps"] * 1.1
+        ):
+            return step
+        previous = step
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(
+    server: str,
+    port: int,
+    workers: int = 1,
+    worker_class: Optional[str] = None,
+    threads: Optional[int] = None,
+) -> List[str]:
+    """
+    Build the command line for the Flask dev server or gunicorn.
+
+    Worker class and threads default to ``gunicorn.conf.py``.
+    """
+    if server == "flask":
+        return [
+            sys.executable,
+            "-m",
+            "flask",
+            "--app",
+            "app",
+            "run",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--no-reload",
+            "--no-debugger",
+        ]
+    if server == "gunicorn":
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "app:app",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+        ]
+        if worker_class:
+            command += ["--worker-class", worker_class]
+        if threads:
+            command += ["--threads", str(threads)]
+        return command
+    raise ValueError(f"Unknown server '{server}'")
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0) -> None:
+    """Poll the landing page until the app answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"App at {base_url} did not become ready in {timeout}s")
+
+
+@contextmanager
+def launched_app(
+    server: str,
+    workers: int = 1,
+    worker_class: Optional[str] = None,
+    threads: Optional[int] = None,
+    trust_client_ips: bool = False,
+) -> Iterator[str]:
+    """
+    Start the app on a scratch copy of the database and yield its base URL.
+
+    ``trust_client_ips`` makes the app key rate limits on the synthetic
+    ``X-Forwarded-For`` addresses sent with ``--clients``.
+    """
+    port = _free_port()
+    command = server_command(server, port, workers, worker_class, threads)
+    with tempfile.TemporaryDirectory(prefix="truebot-load-") as scratch:
+        env = {**os.environ, "TRUEBOT_DB_PATH": str(Path(scratch) / "truebot.db")}
+        if trust_client_ips:
+            env["TRUEBOT_TRUSTED_PROXY_HOPS"] = "1"
+        if DB_PATH.exists():
+            shutil.copy2(DB_PATH, env["TRUEBOT_DB_PATH"])
+        else:
+            subprocess.run(
+                [sys.executable, str(ROOT / "scripts" / "init_db.py")],
+                cwd=ROOT,
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+        process = subprocess.Popen(
+            command,
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            wait_until_ready(base_url)
+            yield base_url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def run_sweep(
+    base_url: str, texts: Sequence[str], args: argparse.Namespace
+) -> Dict[str, object]:
+    """Run every load level in turn and attach the saturation verdict."""
+    steps = []
+    for level in args.levels:
+        start = time.perf_counter()
+        if args.mode == "open":
+            results = run_open_loop(
+                base_url,
+                texts,
+                level,
+                args.duration,
+                args.predict_ratio,
+                args.timeout,
+                clients=args.clients,
+            )
+        else:
+            results = run_closed_loop(
+                base_url,
+                texts,
+                int(level),
+                args.duration,
+                args.predict_ratio,
+                args.timeout,
+                clients=args.clients,
+            )
+        step = {"level": level, **summarize(results, time.perf_counter() - start)}
+        print(json.dumps(step))
+        steps.append(step)
+    saturation = find_saturation(steps, args.mode, args.slo_p99_ms, args.max_error_rate)
+    return {
+        "server": args.server,
+        "workers": args.workers,
+        "worker_class": args.worker_class,
+        "threads": args.threads,
+        "mode": args.mode,
+        "predict_ratio": args.predict_ratio,
+        "steps": steps,
+        "saturation_level": saturation["level"] if saturation else None,
+    }
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay traffic against TrueBot")
+    parser.add_argument(
+        "--server", choices=("flask", "gunicorn", "external"), default="flask"
+    )
+    parser.add_argument("--url", help="Base URL when --server external")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--worker-class", help="gunicorn worker class (default: gunicorn.conf.py)"
+    )
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--mode", choices=("open", "closed"), default="open")
+    parser.add_argument(
+        "--levels",
+        type=lambda value: [float(part) for part in value.split(",")],
+        default=[5.0, 10.0, 20.0, 40.0],
+        help="Comma-separated target RPS (open) or client counts (closed)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=15.0, help="Seconds per level"
+    )
+    parser.add_argument("--predict-ratio", type=float, default=0.5)
+    parser.add_argument("--source", choices=("manual", "csv"), default="csv")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument(
+        "--clients",
+        type=int,
+        help="Spread requests over N synthetic X-Forwarded-For client IPs; a "
+        "launched app is told to trust them, an external one must already. "
+        f"Default: {LAUNCHED_APP_CLIENTS} for a launched app, 0 for external; "
+        "pass 0 to send everything as one client and exercise rate limits",
+    )
+    parser.add_argument("--slo-p99-ms", type=float, default=1000.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+    if args.server == "external" and not args.url:
+        parser.error("--url is required with --server external")
+    if args.clients is None:
+        args.clients = 0 if args.server == "external" else LAUNCHED_APP_CLIENTS
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    texts = load_texts(args.source, args.limit)
+    if args.server == "external":
+        report = run_sweep(args.url.rstrip("/"), texts, args)
+    else:
+        with launched_app(
+            args.server,
+            args.workers,
+            args.worker_class,
+            args.threads,
+            trust_client_ips=args.clients > 0,
+        ) as url:
+            report = run_sweep(url, texts, args)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
 """
 Generate a large synthetic-yet-realistic dataset covering common news queries.
+
+Run without arguments to rebuild ``data/news.csv`` from the template
+cross-product. Pass ``--rows`` to switch to the streaming generator, which
+writes seeded shards of arbitrary size in bounded memory::
+
+    python scripts/prepare_dataset.py --rows 10000000 --shards 16 --workers 8 \\
+        --format parquet --output data/synthetic
 """
 
 from __future__ import annotations
 
+import argparse
+import csv
+import json
 import random
+from concurrent.futures import ProcessPoolExecutor
 from itertools import product, cycle
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
@@ -32,6 +43,146 @@ FAKE_CLAUSES = [
 ]
 
 
+REAL_EXTRA_CLAUSES = [
+    "a spokesperson told reporters on the record.",
+    "the figures were published on the agency website.",
+    "according to the filing reviewed by auditors.",
+    "officials said in a written statement.",
+    "as confirmed by two independent wire services.",
+]
+
+FAKE_EXTRA_CLAUSES = [
+    "the post urged readers to forward it immediately.",
+    "no outlet has been able to verify the claim.",
+    "the screenshot was shared thousands of times without a source.",
+    "the video's origin remains unknown.",
+    "the message warned that the truth was being hidden.",
+]
+
+# Neutral datelines and bylines shared by both labels: they add variety
+# without leaking the label into the vocabulary.
+LEADS = [
+    "On {weekday}, {month} {day},",
+    "In {city} on {month} {day},",
+    "Late on {weekday} in {city},",
+    "Earlier this week in {city}, {month} {day} -",
+    "Updated {month} {day}, {city}:",
+    "{city} ({month} {day}) -",
+    "In a report filed from {city} on {weekday}, {month} {day},",
+]
+
+BYLINES = [
+    "Reporting by {first} {last}.",
+    "Written by {first} {last} in {city}.",
+    "Additional reporting by {first} {last}.",
+    "Compiled by {first} {last} on {weekday}.",
+]
+
+DATELINE_FIELDS: Dict[str, List[str]] = {
+    "weekday": [
+        "Monday",
+        "Tuesday",
+        "Wednesday",
+        "Thursday",
+        "Friday",
+        "Saturday",
+        "Sunday",
+    ],
+    "city": [
+        "Geneva",
+        "Brussels",
+        "Nairobi",
+        "New Delhi",
+        "Ottawa",
+        "Singapore",
+        "Sao Paulo",
+        "Sydney",
+        "London",
+        "Washington",
+        "Tokyo",
+        "Johannesburg",
+    ],
+    "month": [
+        "January",
+        "February",
+        "March",
+        "April",
+        "May",
+        "June",
+        "July",
+        "August",
+        "September",
+        "October",
+        "November",
+        "December",
+    ],
+    "day": [str(day) for day in range(1, 29)],
+    "first": [
+        "Amara",
+        "Ben",
+        "Chen",
+        "Diego",
+        "Elena",
+        "Farah",
+        "Goran",
+        "Hana",
+        "Ivan",
+        "Jia",
+        "Kofi",
+        "Lena",
+        "Mateo",
+        "Nadia",
+        "Omar",
+        "Priya",
+        "Quinn",
+        "Rosa",
+        "Sven",
+        "Tariq",
+    ],
+    "last": [
+        "Adeyemi",
+        "Brooks",
+        "Castillo",
+        "Dubois",
+        "Eriksen",
+        "Fischer",
+        "Gupta",
+        "Haddad",
+        "Ito",
+        "Jensen",
+        "Kowalski",
+        "Lopez",
+        "Mensah",
+        "Novak",
+        "Okafor",
+        "Petrov",
+        "Rossi",
+        "Singh",
+        "Tanaka",
+        "Weber",
+    ],
+}
+
+SYNONYMS: Dict[str, List[str]] = {
+    "announced": ["announced", "unveiled", "launched", "outlined"],
+    "approved": ["approved", "signed off on", "ratified"],
+    "confirmed": ["confirmed", "verified", "acknowledged"],
+    "expanded": ["expanded", "scaled up", "broadened"],
+    "reported": ["reported", "stated", "noted"],
+    "published": ["published", "issued", "circulated"],
+    "claimed": ["claimed", "alleged", "asserted"],
+    "insisted": ["insisted", "maintained", "swore"],
+    "said": ["said", "announced", "revealed"],
+    "during": ["during", "throughout", "over"],
+    "across": ["across", "throughout", "among"],
+    "after": ["after", "following", "shortly after"],
+}
+
+STREAM_FORMATS = ("csv", "jsonl", "parquet")
+STREAM_FIELDNAMES = ("text", "label")
+DEFAULT_CHUNK_SIZE = 50_000
+
+
 def expand_templates(template: str, fields: Dict[str, List[str]]) -> Iterable[str]:
     keys = list(fields.keys())
     for combo in product(*(fields[key] for key in keys)):
@@ -39,309 +190,471 @@ def expand_templates(template: str, fields: Dict[str, List[str]]) -> Iterable[st
         yield template.format(**values)
 
 
-def build_real_samples() -> List[str]:
-    builders = [
-        {
-            "template": (
-                "{agency} {action} {initiative} in {region} to {goal} by {timeline}"
-            ),
-            "fields": {
-                "agency": [
-                    "The World Health Organization",
-                    "The European Central Bank",
-                    "The Indian Space Research Organisation",
-                    "The African Union Commission",
-                ],
-                "action": [
-                    "announced",
-                    "approved",
-                    "confirmed",
-                    "expanded",
-                ],
-                "initiative": [
-                    "a coordinated vaccination drive",
-                    "a resilience funding program",
-                    "a satellite monitoring mission",
-                    "a trade facilitation framework",
-                ],
-                "region": [
-                    "South Asia",
-                    "the Eurozone",
-                    "East Africa",
-                    "Latin America",
-                ],
-                "goal": [
-                    "support rural clinics",
-                    "stabilise commodity markets",
-                    "improve disaster forecasting",
-                    "modernise cross-border logistics",
-                ],
-                "timeline": [
-                    "the end of 2025",
-                    "Q3 2026",
-                    "the upcoming fiscal year",
-                    "early next quarter",
-                ],
-            },
+REAL_BUILDERS: List[Dict] = [
+    {
+        "template": (
+            "{agency} {action} {initiative} in {region} to {goal} by {timeline}"
+        ),
+        "fields": {
+            "agency": [
+                "The World Health Organization",
+                "The European Central Bank",
+                "The Indian Space Research Organisation",
+                "The African Union Commission",
+            ],
+            "action": [
+                "announced",
+                "approved",
+                "confirmed",
+                "expanded",
+            ],
+            "initiative": [
+                "a coordinated vaccination drive",
+                "a resilience funding program",
+                "a satellite monitoring mission",
+                "a trade facilitation framework",
+            ],
+            "region": [
+                "South Asia",
+                "the Eurozone",
+                "East Africa",
+                "Latin America",
+            ],
+            "goal": [
+                "support rural clinics",
+                "stabilise commodity markets",
+                "improve disaster forecasting",
+                "modernise cross-border logistics",
+            ],
+            "timeline": [
+                "the end of 2025",
+                "Q3 2026",
+                "the upcoming fiscal year",
+                "early next quarter",
+            ],
         },
-        {
-            "template": (
-                "{authority} reported that {metric} {change} across {sector} during {period}"
-            ),
-            "fields": {
-                "authority": [
-                    "The U.S. Bureau of Labor Statistics",
-                    "Statistics Canada",
-                    "Eurostat",
-                    "The Reserve Bank of India",
-                ],
-                "metric": [
-                    "employment levels",
-                    "consumer confidence",
-                    "manufacturing output",
-                    "inflation-adjusted wages",
-                ],
-                "change": [
-                    "rose steadily",
-                    "remained stable",
-                    "declined slightly",
-                    "saw record growth",
-                ],
-                "sector": [
-                    "technology firms",
-                    "renewable energy companies",
-                    "public infrastructure projects",
-                    "small retail businesses",
-                ],
-                "period": [
-                    "the previous quarter",
-                    "the last twelve months",
-                    "the latest reporting cycle",
-                    "the current fiscal period",
-                ],
-            },
+    },
+    {
+        "template": (
+            "{authority} reported that {metric} {change} across {sector} during {period}"
+        ),
+        "fields": {
+            "authority": [
+                "The U.S. Bureau of Labor Statistics",
+                "Statistics Canada",
+                "Eurostat",
+                "The Reserve Bank of India",
+            ],
+            "metric": [
+                "employment levels",
+                "consumer confidence",
+                "manufacturing output",
+                "inflation-adjusted wages",
+            ],
+            "change": [
+                "rose steadily",
+                "remained stable",
+                "declined slightly",
+                "saw record growth",
+            ],
+            "sector": [
+                "technology firms",
+                "renewable energy companies",
+                "public infrastructure projects",
+                "small retail businesses",
+            ],
+            "period": [
+                "the previous quarter",
+                "the last twelve months",
+                "the latest reporting cycle",
+                "the current fiscal period",
+            ],
         },
-        {
-            "template": (
-                "{university} researchers {verb} a peer-reviewed study on {topic} impacting {population}"
-            ),
-            "fields": {
-                "university": [
-                    "MIT",
-                    "Oxford University",
-                    "National University of Singapore",
-                    "University of Cape Town",
-                ],
-                "verb": [
-                    "published",
-                    "released",
-                    "presented",
-                    "updated",
-                ],
-                "topic": [
-                    "urban heat mitigation",
-                    "precision agriculture tooling",
-                    "digital payment security",
-                    "public health preparedness",
-                ],
-                "population": [
-                    "metropolitan residents",
-                    "smallholder farmers",
-                    "banking customers",
-                    "emergency responders",
-                ],
-            },
+    },
+    {
+        "template": (
+            "{university} researchers {verb} a peer-reviewed study on {topic} impacting {population}"
+        ),
+        "fields": {
+            "university": [
+                "MIT",
+                "Oxford University",
+                "National University of Singapore",
+                "University of Cape Town",
+            ],
+            "verb": [
+                "published",
+                "released",
+                "presented",
+                "updated",
+            ],
+            "topic": [
+                "urban heat mitigation",
+                "precision agriculture tooling",
+                "digital payment security",
+                "public health preparedness",
+            ],
+            "population": [
+                "metropolitan residents",
+                "smallholder farmers",
+                "banking customers",
+                "emergency responders",
+            ],
         },
-        {
-            "template": (
-                "{league} {team_action} {team_name} after {event} during {season}"
-            ),
-            "fields": {
-                "league": [
-                    "The Premier League",
-                    "The NBA",
-                    "La Liga",
-                    "The IPL",
-                ],
-                "team_action": [
-                    "awarded fair play recognition to",
-                    "confirmed a contract extension with",
-                    "introduced new performance analytics for",
-                    "scheduled international friendlies for",
-                ],
-                "team_name": [
-                    "Arsenal",
-                    "Los Angeles Sparks",
-                    "FC Barcelona",
-                    "Mumbai Indians",
-                ],
-                "event": [
-                    "the latest governing council review",
-                    "the championship finals",
-                    "a data-driven audit",
-                    "a youth academy showcase",
-                ],
-                "season": [
-                    "the 2024-25 season",
-                    "the summer tour",
-                    "the winter session",
-                    "the preseason window",
-                ],
-            },
+    },
+    {
+        "template": (
+            "{league} {team_action} {team_name} after {event} during {season}"
+        ),
+        "fields": {
+            "league": [
+                "The Premier League",
+                "The NBA",
+                "La Liga",
+                "The IPL",
+            ],
+            "team_action": [
+                "awarded fair play recognition to",
+                "confirmed a contract extension with",
+                "introduced new performance analytics for",
+                "scheduled international friendlies for",
+            ],
+            "team_name": [
+                "Arsenal",
+                "Los Angeles Sparks",
+                "FC Barcelona",
+                "Mumbai Indians",
+            ],
+            "event": [
+                "the latest governing council review",
+                "the championship finals",
+                "a data-driven audit",
+                "a youth academy showcase",
+            ],
+            "season": [
+                "the 2024-25 season",
+                "the summer tour",
+                "the winter session",
+                "the preseason window",
+            ],
         },
-    ]
+    },
+]
+
+
+def build_real_samples() -> List[str]:
     clauses = cycle(REAL_CLAUSES)
     samples: List[str] = []
-    for builder in builders:
+    for builder in REAL_BUILDERS:
         for sentence in expand_templates(builder["template"], builder["fields"]):
             text = f"{sentence} {next(clauses)}"
             samples.append(text)
     return samples
 
 
-def build_fake_samples() -> List[str]:
-    builders = [
-        {
-            "template": (
-                "{source} claimed that {celebrity} {action} by {absurdity} on {platform}"
-            ),
-            "fields": {
-                "source": [
-                    "A viral meme",
-                    "An unverified vlog",
-                    "A clickbait microblog",
-                    "An anonymous chain email",
-                ],
-                "celebrity": [
-                    "a famous pop star",
-                    "a retired astronaut",
-                    "a tech billionaire",
-                    "a television chef",
-                ],
-                "action": [
-                    "cured every disease",
-                    "reversed climate change",
-                    "teleported across continents",
-                    "printed unlimited money",
-                ],
-                "absurdity": [
-                    "whispering to moonlight",
-                    "installing secret crystals",
-                    "drinking glowing smoothies",
-                    "tuning pyramids with headphones",
-                ],
-                "platform": [
-                    "a private livestream",
-                    "a hidden forum",
-                    "an encrypted group",
-                    "a disappearing story",
-                ],
-            },
+FAKE_BUILDERS: List[Dict] = [
+    {
+        "template": (
+            "{source} claimed that {celebrity} {action} by {absurdity} on {platform}"
+        ),
+        "fields": {
+            "source": [
+                "A viral meme",
+                "An unverified vlog",
+                "A clickbait microblog",
+                "An anonymous chain email",
+            ],
+            "celebrity": [
+                "a famous pop star",
+                "a retired astronaut",
+                "a tech billionaire",
+                "a television chef",
+            ],
+            "action": [
+                "cured every disease",
+                "reversed climate change",
+                "teleported across continents",
+                "printed unlimited money",
+            ],
+            "absurdity": [
+                "whispering to moonlight",
+                "installing secret crystals",
+                "drinking glowing smoothies",
+                "tuning pyramids with headphones",
+            ],
+            "platform": [
+                "a private livestream",
+                "a hidden forum",
+                "an encrypted group",
+                "a disappearing story",
+            ],
         },
-        {
-            "template": (
-                "{rumour_origin} insisted {government} legalized {ridiculous_item} to {nonsense_goal}"
-            ),
-            "fields": {
-                "rumour_origin": [
-                    "A fabricated document",
-                    "A spoof news site",
-                    "A conspiracy newsletter",
-                    "A forged SMS alert",
-                ],
-                "government": [
-                    "the United Nations",
-                    "the U.S. Congress",
-                    "the Supreme Court",
-                    "the Central Bank",
-                ],
-                "ridiculous_item": [
-                    "time travel lotteries",
-                    "gravity taxes",
-                    "mind-control umbrellas",
-                    "unicorn livestock permits",
-                ],
-                "nonsense_goal": [
-                    "erase all debts instantly",
-                    "ban rainy Mondays",
-                    "power cities with wishes",
-                    "replace passports with emojis",
-                ],
-            },
+    },
+    {
+        "template": (
+            "{rumour_origin} insisted {government} legalized {ridiculous_item} to {nonsense_goal}"
+        ),
+        "fields": {
+            "rumour_origin": [
+                "A fabricated document",
+                "A spoof news site",
+                "A conspiracy newsletter",
+                "A forged SMS alert",
+            ],
+            "government": [
+                "the United Nations",
+                "the U.S. Congress",
+                "the Supreme Court",
+                "the Central Bank",
+            ],
+            "ridiculous_item": [
+                "time travel lotteries",
+                "gravity taxes",
+                "mind-control umbrellas",
+                "unicorn livestock permits",
+            ],
+            "nonsense_goal": [
+                "erase all debts instantly",
+                "ban rainy Mondays",
+                "power cities with wishes",
+                "replace passports with emojis",
+            ],
         },
-        {
-            "template": (
-                "{portal} reported oceans turned into {liquid} after {imaginary_event} in {location}"
-            ),
-            "fields": {
-                "portal": [
-                    "A fringe astrology portal",
-                    "A parody investment channel",
-                    "A hoax science blog",
-                    "A spam news app",
-                ],
-                "liquid": [
-                    "sparkling soda",
-                    "liquid chocolate",
-                    "anti-gravity gel",
-                    "instant coffee",
-                ],
-                "imaginary_event": [
-                    "two comets colliding",
-                    "a wizard summit",
-                    "a secret microwave experiment",
-                    "planets aligning with Wi-Fi signals",
-                ],
-                "location": [
-                    "the Pacific Ocean",
-                    "the Arctic circle",
-                    "the Mediterranean Sea",
-                    "the Amazon basin",
-                ],
-            },
+    },
+    {
+        "template": (
+            "{portal} reported oceans turned into {liquid} after {imaginary_event} in {location}"
+        ),
+        "fields": {
+            "portal": [
+                "A fringe astrology portal",
+                "A parody investment channel",
+                "A hoax science blog",
+                "A spam news app",
+            ],
+            "liquid": [
+                "sparkling soda",
+                "liquid chocolate",
+                "anti-gravity gel",
+                "instant coffee",
+            ],
+            "imaginary_event": [
+                "two comets colliding",
+                "a wizard summit",
+                "a secret microwave experiment",
+                "planets aligning with Wi-Fi signals",
+            ],
+            "location": [
+                "the Pacific Ocean",
+                "the Arctic circle",
+                "the Mediterranean Sea",
+                "the Amazon basin",
+            ],
         },
-        {
-            "template": (
-                "{post} said that {company} will pay {amount} to anyone who {impossible_task}"
-            ),
-            "fields": {
-                "post": [
-                    "A screenshot of a fake press release",
-                    "A recycled hoax post",
-                    "A doctored advertisement",
-                    "A spam SMS screenshot",
-                ],
-                "company": [
-                    "NASA",
-                    "The International Olympic Committee",
-                    "Federal Reserve",
-                    "WHO",
-                ],
-                "amount": [
-                    "$5 million",
-                    "$12 billion",
-                    "10,000 gold bars",
-                    "a lifetime supply of diamonds",
-                ],
-                "impossible_task": [
-                    "forward a message to ten suns",
-                    "hold your breath for an hour",
-                    "decode alien emojis",
-                    "jump from Earth to Mars",
-                ],
-            },
+    },
+    {
+        "template": (
+            "{post} said that {company} will pay {amount} to anyone who {impossible_task}"
+        ),
+        "fields": {
+            "post": [
+                "A screenshot of a fake press release",
+                "A recycled hoax post",
+                "A doctored advertisement",
+                "A spam SMS screenshot",
+            ],
+            "company": [
+                "NASA",
+                "The International Olympic Committee",
+                "Federal Reserve",
+                "WHO",
+            ],
+            "amount": [
+                "$5 million",
+                "$12 billion",
+                "10,000 gold bars",
+                "a lifetime supply of diamonds",
+            ],
+            "impossible_task": [
+                "forward a message to ten suns",
+                "hold your breath for an hour",
+                "decode alien emojis",
+                "jump from Earth to Mars",
+            ],
         },
-    ]
+    },
+]
+
+
+def build_fake_samples() -> List[str]:
     clauses = cycle(FAKE_CLAUSES)
     samples: List[str] = []
-    for builder in builders:
+    for builder in FAKE_BUILDERS:
         for sentence in expand_templates(builder["template"], builder["fields"]):
             text = f"{sentence} {next(clauses)}"
             samples.append(text)
     return samples
 
 
-def main() -> None:
+def shard_bounds(rows: int, shards: int, index: int) -> Tuple[int, int]:
+    """Return the half-open row range owned by one shard."""
+    base, extra = divmod(rows, shards)
+    start = index * base + min(index, extra)
+    return start, start + base + (1 if index < extra else 0)
+
+
+def _swap_synonyms(sentence: str, rng: random.Random) -> str:
+    words = sentence.split(" ")
+    for position, word in enumerate(words):
+        options = SYNONYMS.get(word)
+        if options:
+            words[position] = rng.choice(options)
+    return " ".join(words)
+
+
+def sample_text(
+    builders: Sequence[Dict], clauses: Sequence[str], rng: random.Random
+) -> str:
+    """Draw one expanded sentence from random template slots."""
+    builder = rng.choice(builders)
+    values = {key: rng.choice(options) for key, options in builder["fields"].items()}
+    sentence = _swap_synonyms(builder["template"].format(**values), rng)
+    dateline = {key: rng.choice(options) for key, options in DATELINE_FIELDS.items()}
+    lead = rng.choice(LEADS).format(**dateline)
+    byline = rng.choice(BYLINES).format(**dateline)
+    return f"{lead} {sentence} {rng.choice(clauses)} {byline}"
+
+
+def generate_records(
+    rows: int, seed: int, shard_index: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, str]]]:
+    """Yield balanced, shuffled chunks of records for a single shard."""
+    rng = random.Random(f"{seed}-{shard_index}")
+    real_clauses = REAL_CLAUSES + REAL_EXTRA_CLAUSES
+    fake_clauses = FAKE_CLAUSES + FAKE_EXTRA_CLAUSES
+    remaining = rows
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        labels = ["real"] * (size // 2) + ["fake"] * (size - size // 2)
+        rng.shuffle(labels)
+        chunk = [
+            {
+                "text": (
+                    sample_text(REAL_BUILDERS, real_clauses, rng)
+                    if label == "real"
+                    else sample_text(FAKE_BUILDERS, fake_clauses, rng)
+                ),
+                "label": label,
+            }
+            for label in labels
+        ]
+        remaining -= size
+        yield chunk
+
+
+class _CsvSink:
+    def __init__(self, path: Path) -> None:
+        self._handle = path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._handle, fieldnames=STREAM_FIELDNAMES)
+        self._writer.writeheader()
+
+    def write(self, records: List[Dict[str, str]]) -> None:
+        self._writer.writerows(records)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class _JsonlSink:
+    def __init__(self, path: Path) -> None:
+        self._handle = path.open("w", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, str]]) -> None:
+        self._handle.writelines(json.dumps(record) + "\n" for record in records)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "Parquet output requires pyarrow to be installed"
+            ) from exc
+
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.string()) for name in STREAM_FIELDNAMES])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, records: List[Dict[str, str]]) -> None:
+        table = self._pa.Table.from_pylist(records, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+SINKS = {"csv": _CsvSink, "jsonl": _JsonlSink, "parquet": _ParquetSink}
+
+
+def write_shard(
+    rows: int,
+    output_dir: Path,
+    fmt: str,
+    seed: int,
+    shard_index: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Path:
+    """Stream one shard to ``part-NNNNN.<fmt>`` chunk by chunk."""
+    path = output_dir / f"part-{shard_index:05d}.{fmt}"
+    sink = SINKS[fmt](path)
+    try:
+        for chunk in generate_records(rows, seed, shard_index, chunk_size):
+            sink.write(chunk)
+    finally:
+        sink.close()
+    return path
+
+
+def stream_dataset(
+    rows: int,
+    output_dir: Path,
+    fmt: str = "csv",
+    shards: int = 1,
+    workers: int = 1,
+    seed: int = 42,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Path]:
+    """
+    Write ``rows`` synthetic records split across ``shards`` files.
+
+    Each shard is seeded from ``(seed, shard_index)`` only, so the output is
+    identical regardless of how many worker processes produce it.
+    """
+    if fmt not in SINKS:
+        raise ValueError(
+            f"Unsupported format '{fmt}', expected one of {STREAM_FORMATS}"
+        )
+    if rows < 1 or shards < 1 or workers < 1 or chunk_size < 1:
+        raise ValueError("rows, shards, workers and chunk_size must be positive")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = []
+    for index in range(shards):
+        start, end = shard_bounds(rows, shards, index)
+        jobs.append((end - start, output_dir, fmt, seed, index, chunk_size))
+    if workers == 1:
+        return [write_shard(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_shard, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+
+def build_template_dataset() -> pd.DataFrame:
+    """Balanced, shuffled template cross-product used for ``data/news.csv``."""
     real = build_real_samples()
     fake = build_fake_samples()
     min_len = min(len(real), len(fake))
@@ -351,12 +664,49 @@ def main() -> None:
         {"text": text, "label": "fake"} for text in fake
     ]
     random.shuffle(records)
-    df = pd.DataFrame(records)
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUTPUT_PATH, index=False)
-    print(f"Wrote {len(df)} records to {OUTPUT_PATH}")
+    return pd.DataFrame(records)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        help="Stream this many rows (tested from 10k up to 100M) instead of the template set",
+    )
+    parser.add_argument("--output", type=Path, help="Output file or shard directory")
+    parser.add_argument("--format", choices=STREAM_FORMATS, default="csv")
+    parser.add_argument("--shards", type=int, default=1, help="Number of output files")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Processes writing shards"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.rows is None:
+        output_path = args.output or OUTPUT_PATH
+        df = build_template_dataset()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_path, index=False)
+        print(f"Wrote {len(df)} records to {output_path}")
+        return
+
+    output_dir = args.output or BASE_DIR / "data" / "synthetic"
+    paths = stream_dataset(
+        args.rows,
+        output_dir,
+        fmt=args.format,
+        shards=args.shards,
+        workers=args.workers,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+    )
+    print(f"Wrote {args.rows} records across {len(paths)} shard(s) to {output_dir}")
 
 
 if __name__ == "__main__":
     main()
-
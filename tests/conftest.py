@@ -0,0 +1,42 @@
+"""Fixtures shared by the test modules."""
+
+import pytest
+from joblib import dump
+from sklearn.linear_model import LogisticRegression
+
+from config import LEMMA_TABLE_NAME
+from modules.fast_preprocessing import save_lemma_table
+from modules.preprocessing import build_vectorizer
+from modules.serving import write_serving_bundle
+
+REAL_TEXTS = [
+    "official bulletin confirmed budget approval",
+    "regulator published audited quarterly figures",
+    "ministry detailed infrastructure plan release",
+]
+FAKE_TEXTS = [
+    "viral meme claimed secret crystals cure disease",
+    "anonymous chain email insisted moon made cheese",
+    "hoax blog concluded wizard summit turned ocean soda",
+]
+
+
+@pytest.fixture()
+def tiny_corpus():
+    """Three real then three fake texts, with labels 1 and 0."""
+    return REAL_TEXTS + FAKE_TEXTS, [1] * len(REAL_TEXTS) + [0] * len(FAKE_TEXTS)
+
+
+@pytest.fixture()
+def tiny_model_dir(tmp_path, tiny_corpus):
+    """Artifacts trained on ``tiny_corpus``, laid out as training writes them."""
+    texts, labels = tiny_corpus
+    path = tmp_path / "tiny_model"
+    path.mkdir()
+    vectorizer = build_vectorizer()
+    classifier = LogisticRegression(C=10).fit(vectorizer.fit_transform(texts), labels)
+    dump(classifier, path / "model.pkl")
+    dump(vectorizer, path / "vectorizer.pkl")
+    save_lemma_table(path / LEMMA_TABLE_NAME, [], {})
+    write_serving_bundle(path / "model.pkl", path / "vectorizer.pkl")
+    return path
@@ -1,17 +1,19 @@
-"""Quick accuracy evaluation utility."""
+"""Quick accuracy evaluation utility for the saved artifacts."""
 
 import json
+import sys
+from pathlib import Path
 
-from config import DATA_PATH, MODEL_DIR
-from modules.train_model import main as train_main
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config import DATA_PATH, MODEL_DIR  # noqa: E402
+from modules.evaluation import main as evaluate_main  # noqa: E402
 
 
 def evaluate() -> None:
-    metrics = train_main(DATA_PATH, MODEL_DIR)
-    print(json.dumps(metrics, indent=2))
+    report = evaluate_main(MODEL_DIR, None, DATA_PATH, None, bootstrap_rounds=200)
+    print(json.dumps(report["metrics"], indent=2))
 
 
 if __name__ == "__main__":
     evaluate()
-
-
@@ -0,0 +1,200 @@
+"""Tests for admission control around the prediction endpoints."""
+
+import runpy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from flask import Flask, jsonify
+
+from config import ADMISSION_CONFIG
+from modules.admission import AdmissionController, AdmissionRejected, TokenBucketLimiter
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_token_bucket_refills_over_time():
+    limiter = TokenBucketLimiter(rate=2.0, burst=2)
+    assert limiter.consume("client", now=0.0) == 0.0
+    assert limiter.consume("client", now=0.0) == 0.0
+    assert limiter.consume("client", now=0.0) == pytest.approx(0.5)
+    assert limiter.consume("client", now=0.5) == 0.0
+    assert limiter.consume("other", now=0.5) == 0.0
+
+
+def test_wait_time_does_not_take_a_token():
+    limiter = TokenBucketLimiter(rate=1.0, burst=1)
+    assert limiter.wait_time("client", now=0.0) == 0.0
+    assert limiter.wait_time("client", now=0.0) == 0.0
+    assert limiter.consume("client", now=0.0) == 0.0
+    assert limiter.wait_time("client", now=0.0) == pytest.approx(1.0)
+
+
+def test_token_bucket_evicts_least_recently_used_key():
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=2)
+    limiter.consume("a", now=0.0)
+    limiter.consume("b", now=0.0)
+    limiter.consume("a", now=0.0)
+    limiter.consume("c", now=0.0)
+    assert list(limiter._buckets) == ["a", "c"]
+    assert limiter.wait_time("a", now=0.0) > 0
+
+
+def test_api_lane_leaves_reserve_for_interactive():
+    controller = AdmissionController(
+        max_inflight=2, interactive_reserve=1, max_queue={"api": 0, "interactive": 0}
+    )
+    controller.acquire("api")
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("api")
+    assert rejected.value.status == 503
+    controller.acquire("interactive")
+    stats = controller.stats()
+    assert stats["in_flight"] == 2
+    assert stats["lanes"]["api"]["shed_queue_full"] == 1
+
+
+def test_queued_request_is_admitted_on_release():
+    controller = AdmissionController(max_inflight=1, queue_timeout=5.0)
+    controller.acquire("interactive")
+    admitted = threading.Event()
+
+    def waiter():
+        controller.acquire("interactive")
+        admitted.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    while controller.stats()["queue_depth"]["interactive"] == 0:
+        pass
+    controller.release()
+    thread.join(timeout=5)
+    assert admitted.is_set()
+    assert controller.stats()["lanes"]["interactive"]["max_queue_depth"] == 1
+
+
+def test_gunicorn_threads_cover_slots_and_lane_queues():
+    settings = runpy.run_path(str(ROOT / "gunicorn.conf.py"))
+    assert settings["threads"] == ADMISSION_CONFIG["max_inflight"] + sum(
+        ADMISSION_CONFIG["max_queue"].values()
+    )
+
+
+def test_interactive_request_is_admitted_ahead_of_queued_api_calls():
+    max_queue = {"interactive": 1, "api": 2}
+    controller = AdmissionController(
+        max_inflight=2, interactive_reserve=0, max_queue=max_queue, queue_timeout=5.0
+    )
+    done = {lane: threading.Event() for lane in ("first", "second", "interactive")}
+
+    def handle(lane, name):
+        controller.acquire(lane)
+        try:
+            if name in done:
+                done[name].wait(5)
+        finally:
+            controller.release()
+
+    def depth(lane):
+        return controller.stats()["queue_depth"][lane]
+
+    # Sized like gunicorn.conf.py, so every request reaches the controller.
+    with ThreadPoolExecutor(max_workers=2 + sum(max_queue.values())) as pool:
+        pool.submit(handle, "api", "first")
+        pool.submit(handle, "api", "second")
+        _wait_until(lambda: controller.stats()["in_flight"] == 2)
+        for index in range(2):
+            pool.submit(handle, "api", f"queued-{index}")
+        _wait_until(lambda: depth("api") == 2)
+        pool.submit(handle, "interactive", "interactive")
+        _wait_until(lambda: depth("interactive") == 1)
+
+        done["first"].set()
+        _wait_until(lambda: depth("interactive") == 0)
+        lanes = controller.stats()["lanes"]
+        assert lanes["interactive"]["admitted"] == 1
+        assert lanes["api"]["admitted"] == 2
+        assert depth("api") == 2
+        done["second"].set()
+        done["interactive"].set()
+    assert controller.stats()["lanes"]["api"]["admitted"] == 4
+
+
+@pytest.fixture()
+def guarded_client():
+    controller = AdmissionController(
+        max_inflight=1,
+        interactive_reserve=0,
+        max_queue={"api": 0, "interactive": 0},
+        rate_limits={"api": (1.0, 2)},
+        max_payload_bytes=64,
+    )
+    app = Flask(__name__)
+
+    @app.route("/predict", methods=["POST"])
+    @controller.guard("api")
+    def predict():
+        return jsonify({"ok": True})
+
+    with app.test_client() as client:
+        yield client, controller
+
+
+def test_guard_rejects_large_payload(guarded_client):
+    client, controller = guarded_client
+    response = client.post("/predict", json={"text": "x" * 100})
+    assert response.status_code == 413
+    assert controller.stats()["lanes"]["api"]["shed_payload"] == 1
+
+
+def test_guard_rate_limits_with_retry_after(guarded_client):
+    client, _ = guarded_client
+    statuses = [
+        client.post("/predict", json={"text": "hi"}).status_code for _ in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+    response = client.post("/predict", json={"text": "hi"})
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_guard_does_not_charge_shed_requests(guarded_client):
+    client, controller = guarded_client
+    controller.acquire("api")
+    statuses = [
+        client.post("/predict", json={"text": "hi"}).status_code for _ in range(3)
+    ]
+    assert statuses == [503, 503, 503]
+    controller.release()
+    statuses = [
+        client.post("/predict", json={"text": "hi"}).status_code for _ in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+
+
+@pytest.mark.parametrize(
+    "hops, forwarded, expected",
+    [
+        (0, "1.1.1.1", "127.0.0.1"),
+        (1, "1.1.1.1, 2.2.2.2", "2.2.2.2"),
+        (2, "1.1.1.1, 2.2.2.2, 3.3.3.3", "2.2.2.2"),
+        (2, "3.3.3.3", "127.0.0.1"),
+    ],
+)
+def test_client_key_ignores_spoofable_forwarded_entries(hops, forwarded, expected):
+    controller = AdmissionController(trusted_proxy_hops=hops)
+    app = Flask(__name__)
+    with app.test_request_context(
+        "/",
+        headers={"X-Forwarded-For": forwarded},
+        environ_base={"REMOTE_ADDR": "127.0.0.1"},
+    ):
+        assert controller.client_key() == expected
@@ -0,0 +1,96 @@
+"""Tests for post-training artifact compression."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from config import DATA_PATH
+from modules import compression
+from modules.preprocessing import build_vectorizer, clean_text
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    df = pd.read_csv(DATA_PATH).sample(n=1200, random_state=0)
+    texts = [clean_text(text) for text in df["text"]]
+    labels = (df["label"] == "real").astype(int).to_numpy()
+    return texts, labels
+
+
+def _fit(classifier, corpus):
+    texts, labels = corpus
+    vectorizer = build_vectorizer()
+    classifier.fit(vectorizer.fit_transform(texts[:1000]), labels[:1000])
+    return classifier, vectorizer
+
+
+def test_compact_forest_matches_sklearn(corpus):
+    forest, vectorizer = _fit(
+        RandomForestClassifier(n_estimators=15, max_features=0.1, random_state=0),
+        corpus,
+    )
+    X = vectorizer.transform(corpus[0])
+    compact = compression.compact_trees(forest)
+    assert isinstance(compact, compression.CompactTreeEnsemble)
+    np.testing.assert_allclose(compact.predict_proba(X), forest.predict_proba(X))
+    np.testing.assert_array_equal(
+        compact.astype(np.float32).predict(X), forest.predict(X)
+    )
+
+
+def test_prune_drops_unused_tree_features(corpus):
+    forest, vectorizer = _fit(
+        RandomForestClassifier(n_estimators=5, max_features=0.05, random_state=0),
+        corpus,
+    )
+    expected = forest.predict(vectorizer.transform(corpus[0]))
+    weights = compression.feature_weights(forest)
+    compact, vectorizer = compression.prune_features(
+        compression.compact_trees(forest), vectorizer, weights, min_weight=0.0
+    )
+    assert len(vectorizer.vocabulary_) == np.count_nonzero(weights)
+    assert compact.n_features_in_ == len(vectorizer.vocabulary_)
+    # Pruning changes the L2 norm of each row, so only near-agreement holds.
+    agreement = np.mean(compact.predict(vectorizer.transform(corpus[0])) == expected)
+    assert agreement > 0.9
+
+
+def test_compress_linear_model_reports_each_step(corpus):
+    classifier, vectorizer = _fit(LogisticRegression(max_iter=1000), corpus)
+    texts, labels = corpus[0][1000:], corpus[1][1000:]
+    classifier, vectorizer, report = compression.compress(
+        classifier, vectorizer, texts, labels, min_weight=0.2
+    )
+    assert [entry["step"] for entry in report] == [
+        "baseline",
+        "compact",
+        "prune",
+        "float32",
+    ]
+    assert report[1]["skipped"] is True
+    assert report[2]["n_features"] < report[0]["n_features"]
+    assert classifier.coef_.dtype == np.float32
+    assert vectorizer.transform(texts[:1]).dtype == np.float32
+    assert classifier.predict_proba(vectorizer.transform(texts)).shape == (
+        len(texts),
+        2,
+    )
+
+
+def test_compact_xgboost_matches_xgboost(corpus):
+    xgboost = pytest.importorskip("xgboost")
+    model, vectorizer = _fit(
+        xgboost.XGBClassifier(
+            n_estimators=30, max_depth=4, learning_rate=0.3, random_state=0
+        ),
+        corpus,
+    )
+    X = vectorizer.transform(corpus[0])
+    expected = model.predict_proba(X)
+    compact = compression.compact_trees(model)
+    np.testing.assert_allclose(compact.predict_proba(X), expected, atol=1e-5)
+    np.testing.assert_allclose(
+        compact.astype(np.float32).predict_proba(X), expected, atol=1e-5
+    )
@@ -0,0 +1,68 @@
+"""Tests for the saved-artifact evaluation harness."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import evaluation
+
+
+def test_classification_metrics_and_calibration():
+    y_true = np.array([1, 1, 0, 0])
+    proba = np.array([0.9, 0.4, 0.2, 0.6])
+    metrics = evaluation.classification_metrics(y_true, proba)
+    assert metrics["accuracy"] == 0.5
+    assert metrics["precision"] == 0.5
+    assert metrics["recall"] == 0.5
+    assert metrics["brier"] == pytest.approx((0.01 + 0.36 + 0.04 + 0.36) / 4)
+    report = evaluation.calibration(y_true, proba, bins=2)
+    assert [b["count"] for b in report["bins"]] == [2, 2]
+    assert report["ece"] == pytest.approx(0.225)
+
+
+def test_bootstrap_intervals_are_reproducible_across_jobs():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 500)
+    proba = np.clip(y_true * 0.6 + rng.random(500) * 0.4, 0, 1)
+    serial = evaluation.bootstrap_intervals(y_true, proba, rounds=40, n_jobs=1)
+    parallel = evaluation.bootstrap_intervals(y_true, proba, rounds=120, n_jobs=2)
+    assert serial == evaluation.bootstrap_intervals(y_true, proba, rounds=40, n_jobs=1)
+    assert parallel == evaluation.bootstrap_intervals(
+        y_true, proba, rounds=120, n_jobs=1
+    )
+    assert serial["accuracy"]["lower"] <= serial["accuracy"]["upper"]
+
+
+def test_main_scores_csv_in_parallel_batches(tmp_path, tiny_corpus, tiny_model_dir):
+    csv_path = tmp_path / "external.csv"
+    texts, labels = tiny_corpus
+    rows = [(text, "REAL" if label else "fake") for text, label in zip(texts, labels)]
+    rows.append(("unlabelled row", "unknown"))
+    pd.DataFrame(rows * 5, columns=["text", "label"]).to_csv(csv_path, index=False)
+    output = tmp_path / "report.json"
+    report = evaluation.main(
+        tiny_model_dir,
+        csv_path,
+        csv_path,
+        output,
+        n_jobs=2,
+        batch_size=4,
+        bootstrap_rounds=20,
+    )
+    assert report["rows"] == 30
+    assert report["metrics"]["accuracy"] == 1.0
+    assert set(report["bootstrap"]["intervals"]) >= {"accuracy", "precision"}
+    assert json.loads(output.read_text())["rows"] == 30
+
+
+def test_csv_batches_accept_numeric_labels_with_gaps(tmp_path, tiny_corpus):
+    csv_path = tmp_path / "numeric.csv"
+    real, fake, unlabelled = tiny_corpus[0][2:5]
+    pd.DataFrame({"text": [real, fake, unlabelled], "label": [1, 0, None]}).to_csv(
+        csv_path, index=False
+    )
+    [(texts, labels)] = evaluation.csv_batches(csv_path, batch_size=10)
+    assert texts == [real, fake]
+    assert labels.tolist() == [1, 0]
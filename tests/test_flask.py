@@ -36,3 +36,24 @@ def test_predict_endpoint_success(test_client, monkeypatch):
     assert data["label"] == "Real"
 
 
+def test_explain_endpoint_requires_text(test_client):
+    response = test_client.post("/explain", json={"text": "  "})
+    assert response.status_code == 400
+
+
+def test_predict_passes_explain_flag(test_client, monkeypatch):
+    calls = {}
+
+    def fake_predict(*_args, **kwargs):
+        calls.update(kwargs)
+        return {"label": "Fake", "confidence": 80.0, "explanation": {"terms": []}}
+
+    monkeypatch.setattr("app.predict_label", fake_predict)
+    monkeypatch.setattr("app.save_manual_input", lambda *_args: None)
+    response = test_client.post(
+        "/predict", json={"text": "Sample", "explain": True, "top_k": 500}
+    )
+    assert response.status_code == 200
+    assert calls["explain"] is True
+    assert calls["top_k"] == 50
+    assert "explanation" in json.loads(response.data)
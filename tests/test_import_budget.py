@@ -0,0 +1,24 @@
+"""Tests for the serving boot budget."""
+
+from config import MODEL_DIR
+from scripts import import_budget
+
+
+def test_committed_model_boots_within_budget():
+    result = import_budget.measure_import("app", MODEL_DIR, runs=2)
+    assert result["forbidden_loaded"] == []
+    assert import_budget.check_budget(result) == []
+
+
+def test_check_budget_reports_each_violation():
+    result = {
+        "import_ms": 950.0,
+        "warm_ms": 700.0,
+        "rss_mb": 210.0,
+        "forbidden_loaded": ["pandas"],
+    }
+    problems = import_budget.check_budget(
+        result, max_ms=800, max_warm_ms=500, max_mb=100
+    )
+    assert len(problems) == 4
+    assert "pandas" in problems[0]
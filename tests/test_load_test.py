@@ -0,0 +1,115 @@
+"""Tests for the traffic replay harness."""
+
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts import load_test
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = 400 if self.path == "/detect" and self.server.fail_detect else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    server.fail_detect = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_load_texts_reads_manual_inputs(tmp_path):
+    db_path = tmp_path / "replay.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE manual_inputs (id INTEGER PRIMARY KEY, text TEXT)")
+    conn.executemany(
+        "INSERT INTO manual_inputs(text) VALUES (?)", [("first",), ("  ",), ("second",)]
+    )
+    conn.commit()
+    conn.close()
+    assert load_test.load_texts("manual", 10, db_path) == ["second", "first"]
+
+
+def test_load_texts_falls_back_to_csv_when_manual_is_empty(tmp_path):
+    db_path = tmp_path / "empty.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE manual_inputs (id INTEGER PRIMARY KEY, text TEXT)")
+    conn.close()
+    assert load_test.load_texts("manual", 3, db_path) == load_test.load_texts(
+        "csv", 3
+    )
+
+
+def test_open_loop_reports_mix_and_errors(stub_server):
+    stub_server.fail_detect = True
+    results = load_test.run_open_loop(
+        _url(stub_server), ["sample"], rate=50, duration=0.4, predict_ratio=0.5
+    )
+    summary = load_test.summarize(results, 0.4)
+    assert summary["requests"] == 20
+    assert set(summary["endpoints"]) == {"/detect", "/predict"}
+    assert summary["error_rate"] == pytest.approx(summary["endpoints"]["/detect"] / 20)
+
+
+def test_closed_loop_keeps_clients_busy(stub_server):
+    results = load_test.run_closed_loop(
+        _url(stub_server), ["sample"], concurrency=2, duration=0.3, predict_ratio=1.0
+    )
+    assert results
+    assert all(result.ok and result.endpoint == "/predict" for result in results)
+
+
+def test_find_saturation_open_and_closed():
+    def step(level, rps, p99=10.0, errors=0.0):
+        return {
+            "level": level,
+            "throughput_rps": rps,
+            "error_rate": errors,
+            "latency_ms": {"p99": p99},
+        }
+
+    open_steps = [step(10, 10), step(20, 19.5), step(40, 25)]
+    assert load_test.find_saturation(open_steps, "open", 500)["level"] == 40
+    slow = [step(10, 10), step(20, 20, p99=900)]
+    assert load_test.find_saturation(slow, "open", 500)["level"] == 20
+    closed_steps = [step(1, 50), step(2, 95), step(4, 100)]
+    assert load_test.find_saturation(closed_steps, "closed", 500)["level"] == 4
+    assert load_test.find_saturation(open_steps[:2], "open", 500) is None
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert load_test.percentile(values, 50) == 50
+    assert load_test.percentile(values, 99) == 99
+    assert load_test.percentile([], 99) == 0.0
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        ([], load_test.LAUNCHED_APP_CLIENTS),
+        (["--clients", "0"], 0),
+        (["--server", "external", "--url", "http://app"], 0),
+    ],
+)
+def test_launched_apps_spread_load_over_clients_by_default(argv, expected):
+    assert load_test.parse_args(argv).clients == expected
@@ -2,9 +2,11 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
+from scipy.sparse import csr_matrix
 
-from config import DATA_PATH, MODEL_DIR, MODEL_PATH, VECTORIZER_PATH
+from config import DATA_PATH, LEMMA_TABLE_PATH, MODEL_DIR, MODEL_PATH, VECTORIZER_PATH
 from modules import predictor
 from modules.train_model import main as train_main
 
@@ -22,3 +24,26 @@ def test_predict_label_returns_confidence(ensure_model):
     assert 0 <= result["confidence"] <= 100
 
 
+def test_committed_model_ships_lemma_table():
+    assert LEMMA_TABLE_PATH.exists()
+
+
+def test_get_preprocessor_requires_lemma_table(tmp_path):
+    with pytest.raises(FileNotFoundError, match="build_lemma_table"):
+        predictor.get_preprocessor(tmp_path / "vectorizer.pkl")
+
+
+def test_warm_up_logs_failures_instead_of_raising(tmp_path, caplog):
+    for name in ("model.pkl", "vectorizer.pkl"):
+        (tmp_path / name).write_bytes(b"not a pickle")
+    predictor.warm_up(tmp_path / "model.pkl", tmp_path / "vectorizer.pkl")
+    assert "Warm-up failed" in caplog.text
+
+
+def test_top_terms_ranks_by_contribution():
+    terms = np.array(["alpha", "beta", "gamma", "delta"])
+    weights = np.array([0.5, -4.0, 1.0, 0.0])
+    row = csr_matrix(np.array([[0.2, 0.5, 0.8, 0.9]]))
+    ranked = predictor.top_terms(row, terms, weights, top_k=2)
+    assert [item["term"] for item in ranked] == ["beta", "gamma"]
+    assert ranked[0]["weight"] == -2.0
@@ -1,6 +1,6 @@
 """Unit tests for preprocessing utilities."""
 
-from modules import preprocessing
+from modules import fast_preprocessing, preprocessing
 
 
 def test_clean_text_lowercase_and_strip():
@@ -18,3 +18,23 @@ def test_preprocess_text_removes_stopwords():
     assert "sentence" in processed
 
 
+class _SuffixLemmatizer:
+    def lemmatize(self, token):
+        return token[:-1] if token.endswith("s") else token
+
+
+def test_lemma_table_matches_nltk_pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(preprocessing, "STOP_WORDS", ["the", "on", "a"])
+    monkeypatch.setattr(preprocessing, "LEMMATIZER", _SuffixLemmatizer())
+    corpus = [
+        "The ministers approved budgets on Monday.",
+        "A viral post claims 3 comets collided!",
+    ]
+    table_path = tmp_path / "lemmas.json"
+    preprocessing.write_lemma_table(corpus, table_path)
+    table = fast_preprocessing.load_lemma_table(table_path)
+    assert "the" in table[0]
+    assert table[1]["ministers"] == "minister"
+    for doc in corpus:
+        expected = preprocessing.preprocess_text(doc)
+        assert fast_preprocessing.preprocess_text(doc, table) == expected
@@ -0,0 +1,67 @@
+"""Tests for the scikit-learn-free serving bundle."""
+
+import numpy as np
+import pytest
+from joblib import dump
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from modules import predictor
+from modules.preprocessing import build_vectorizer
+from modules.serving import (
+    LogisticScorer,
+    TfidfFeatures,
+    load_serving_bundle,
+    to_serving,
+)
+
+UNSEEN = ["regulator confirmed viral budget", "cheese moon", "nothing in vocabulary"]
+
+
+@pytest.mark.parametrize(
+    "classifier",
+    [LogisticRegression(), RandomForestClassifier(n_estimators=5, random_state=0)],
+)
+def test_bundle_matches_sklearn(classifier, tiny_corpus):
+    texts, labels = tiny_corpus
+    vectorizer = build_vectorizer()
+    classifier.fit(vectorizer.fit_transform(texts), labels)
+    scorer, features = to_serving(classifier, vectorizer)
+    expected = vectorizer.transform(UNSEEN)
+    actual = features.transform(UNSEEN)
+    assert np.array_equal(actual.indices, expected.indices)
+    np.testing.assert_allclose(actual.toarray(), expected.toarray())
+    np.testing.assert_allclose(
+        scorer.predict_proba(actual), classifier.predict_proba(expected), atol=1e-12
+    )
+
+
+def test_features_keep_vectorizer_dtype(tiny_corpus):
+    vectorizer = build_vectorizer()
+    vectorizer.set_params(dtype=np.float32).fit(tiny_corpus[0])
+    features = TfidfFeatures.from_sklearn(vectorizer)
+    actual = features.transform(UNSEEN)
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(
+        actual.toarray(), vectorizer.transform(UNSEEN).toarray(), atol=1e-6
+    )
+
+
+def test_stale_bundle_is_ignored(tiny_model_dir):
+    model_path = tiny_model_dir / "model.pkl"
+    vectorizer_path = tiny_model_dir / "vectorizer.pkl"
+    assert load_serving_bundle(model_path, vectorizer_path) is not None
+    dump(LogisticRegression(C=0.1), model_path)
+    assert load_serving_bundle(model_path, vectorizer_path) is None
+
+
+def test_load_artifacts_prefers_bundle(tiny_model_dir):
+    predictor.load_artifacts.cache_clear()
+    try:
+        loaded, features = predictor.load_artifacts(
+            tiny_model_dir / "model.pkl", tiny_model_dir / "vectorizer.pkl"
+        )
+    finally:
+        predictor.load_artifacts.cache_clear()
+    assert isinstance(loaded, LogisticScorer)
+    assert isinstance(features, TfidfFeatures)
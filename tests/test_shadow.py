@@ -0,0 +1,87 @@
+"""Tests for shadow evaluation and promotion."""
+
+import os
+import signal
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from modules.shadow import ShadowEvaluator, has_artifacts, promote_shadow
+
+
+def test_shadow_scores_copies_in_background(tiny_corpus, tiny_model_dir):
+    real, fake = tiny_corpus[0][0], tiny_corpus[0][-1]
+    evaluator = ShadowEvaluator(tiny_model_dir, queue_size=10)
+    assert evaluator.submit(real, {"label": "Real", "confidence": 90.0}, 2.0)
+    assert evaluator.submit(fake, {"label": "Real", "confidence": 60.0}, 3.0)
+    evaluator.drain()
+    stats = evaluator.stats()
+    assert stats["scored"] == 2
+    assert stats["agreement_rate"] == 0.5
+    assert stats["p_real_delta"]["max_abs"] > 0
+    assert stats["scoring_cpu_ms"]["active"]["p50"] == 2.5
+    assert stats["scoring_cpu_ms"]["shadow"]["p50"] > 0
+    evaluator.close()
+
+
+def test_shadow_skips_cold_latency_samples(tiny_corpus, tiny_model_dir):
+    evaluator = ShadowEvaluator(tiny_model_dir, queue_size=10)
+    evaluator.submit(tiny_corpus[0][0], {"label": "Real", "confidence": 90.0}, None)
+    evaluator.drain()
+    assert evaluator._process.pid != os.getpid()
+    stats = evaluator.stats()
+    assert stats["scored"] == 1
+    # Neither the active load nor the candidate's first, cold call is timed.
+    assert evaluator._active_cpu_ms == evaluator._shadow_cpu_ms == deque()
+    evaluator.close()
+
+
+def _collectors():
+    return sum(t.name == "shadow-collector" for t in threading.enumerate())
+
+
+def test_dead_worker_copies_count_as_errors(tiny_corpus, tiny_model_dir):
+    texts = tiny_corpus[0]
+    evaluator = ShadowEvaluator(tiny_model_dir, queue_size=10)
+    prediction = {"label": "Real", "confidence": 90.0}
+    evaluator.submit(texts[0], prediction, 1.0)
+    evaluator.drain()
+    process = evaluator._process
+    os.kill(process.pid, signal.SIGSTOP)
+    for text in texts[1:4]:
+        evaluator.submit(text, prediction, 1.0)
+    os.kill(process.pid, signal.SIGKILL)
+    process.join(timeout=5)
+
+    evaluator.submit(texts[0], prediction, 1.0)
+    evaluator.drain(timeout=30)
+    stats = evaluator.stats()
+    assert evaluator._process is not process
+    assert (stats["scored"], stats["errors"], stats["queue_depth"]) == (2, 3, 0)
+    # The old collector was told to stop; only the new one keeps running.
+    deadline = time.monotonic() + 5
+    while _collectors() > 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _collectors() == 1
+    evaluator.close()
+
+
+def test_shadow_disabled_without_candidate(tmp_path):
+    evaluator = ShadowEvaluator(tmp_path / "missing")
+    assert not evaluator.submit("text", {"label": "Real", "confidence": 90.0}, 1.0)
+    assert evaluator.stats()["submitted"] == 0
+
+
+def test_promote_shadow_keeps_previous(tmp_path, tiny_model_dir):
+    active = tmp_path / "model"
+    active.mkdir()
+    (active / "model.pkl").write_text("old")
+    (active / "vectorizer.pkl").write_text("old")
+    backup = promote_shadow(active, tiny_model_dir)
+    assert (backup / "model.pkl").read_text() == "old"
+    assert has_artifacts(active)
+    assert not has_artifacts(tiny_model_dir)
+    with pytest.raises(FileNotFoundError):
+        promote_shadow(active, tiny_model_dir)
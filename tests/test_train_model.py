@@ -0,0 +1,80 @@
+"""Tests for dataset loading and cleaning."""
+
+import pandas as pd
+import pytest
+
+from modules.train_model import load_dataset, normalize_labels
+
+ROWS = [
+    ("The central bank confirmed the new policy today.", "REAL"),
+    ("the central bank confirmed   the new policy today!", "real"),
+    ("A viral post claimed the moon is made of cheese.", "Fake"),
+    ("A viral post claimed the moon is made of cheese (2).", "fake"),
+    ("The moon is made of cheese, a viral post claimed.", "0"),
+    ("Shared in a group chat without any source at all.", "fake"),
+    ("Shared in a group chat without any source at all.", "real"),
+    ("Too short", "real"),
+    ("Officials published audited figures for the quarter.", "maybe"),
+    (None, "real"),
+]
+
+
+@pytest.fixture()
+def dataset_path(tmp_path):
+    path = tmp_path / "news.csv"
+    pd.DataFrame(ROWS, columns=["text", "label"]).to_csv(path, index=False)
+    return path
+
+
+def test_load_dataset_reports_each_rule(dataset_path):
+    df = load_dataset(dataset_path, chunksize=3)
+    report = df.attrs["cleaning_report"]
+    assert report["missing"] == 1
+    assert report["invalid_label"] == 1
+    assert report["too_short"] == 1
+    assert report["exact_duplicates"] == 2
+    assert report["label_conflicts"] == 1
+    assert report["rows_kept"] == len(df) == 4
+    assert set(df["label"]) == {"real", "fake"}
+
+
+def test_load_dataset_collapses_near_duplicates(dataset_path):
+    df = load_dataset(dataset_path, chunksize=4, near_dedup=True)
+    assert df.attrs["cleaning_report"]["near_duplicates"] == 2
+    assert len(df) == 2
+
+
+def test_load_dataset_requires_columns(tmp_path):
+    path = tmp_path / "bad.csv"
+    pd.DataFrame({"body": ["x"]}).to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        load_dataset(path)
+
+
+def test_load_dataset_accepts_numeric_labels_with_gaps(tmp_path):
+    path = tmp_path / "numeric.csv"
+    pd.DataFrame(
+        {
+            "text": [
+                "Officials published audited figures for the quarter.",
+                "A viral post claimed the moon is made of cheese.",
+                "Shared in a group chat without any source at all.",
+            ],
+            "label": [1, 0, None],
+        }
+    ).to_csv(path, index=False)
+    df = load_dataset(path)
+    assert df["label"].tolist() == ["real", "fake"]
+    assert df.attrs["cleaning_report"]["missing"] == 1
+
+
+def test_normalize_labels_handles_floats_and_aliases():
+    labels = pd.Series([1.0, 0.0, "1.0", " TRUE ", "unreliable", 2, 0.5])
+    assert normalize_labels(labels).tolist()[:5] == [
+        "real",
+        "fake",
+        "real",
+        "real",
+        "fake",
+    ]
+    assert normalize_labels(labels)[5:].isna().all()